@@ -0,0 +1,74 @@
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_COMPACT_ARGS = {"separators": (",", ":"), "ensure_ascii": False}
+
+
+def dumps(obj, **serializer_args) -> bytes:
+    """
+    Serializes an object to compact UTF-8 encoded JSON.
+
+    orjson is used when it is installed and no serializer args are given. Otherwise, or if orjson rejects the object,
+    it is serialized with `json.dumps`, using the same compact separators unless they are overridden. The output of
+    both differs for float exponents and non-finite floats, and only orjson serializes datetime and UUID values.
+
+    Args:
+        obj: JSON serializable object.
+        serializer_args: Args that should be passed to `json.dumps`.
+
+    Returns:
+        bytes: JSON document.
+    """
+    if orjson is not None and not serializer_args:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # orjson rejects some values the standard library accepts, such as integers wider than 64 bits.
+            pass
+    return _stdlib_dumps(obj, serializer_args)
+
+
+def dumps_line(obj, **serializer_args) -> bytes:
+    """
+    Serializes an object like `dumps`, followed by a newline. With orjson, the newline is added during serialization.
+
+    Args:
+        obj: JSON serializable object.
+        serializer_args: Args that should be passed to `json.dumps`.
+
+    Returns:
+        bytes: Newline terminated JSON document.
+    """
+    if orjson is not None and not serializer_args:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+        except orjson.JSONEncodeError:
+            pass
+    return _stdlib_dumps(obj, serializer_args) + b"\n"
+
+
+def _stdlib_dumps(obj, serializer_args: dict) -> bytes:
+    args = {**_COMPACT_ARGS, **serializer_args}
+    try:
+        return json.dumps(obj, **args).encode("utf-8")
+    except UnicodeEncodeError:
+        # Lone surrogates, such as those decoded with surrogateescape, can't be encoded as UTF-8, so they are escaped.
+        return json.dumps(obj, **{**args, "ensure_ascii": True}).encode("utf-8")
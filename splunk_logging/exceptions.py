@@ -39,6 +39,15 @@ class HecBatchError(HecError):
         )
 
 
+class HecPartialDeliveryError(HecError):
+    """Raised when a batched request fails after HEC accepted the events of earlier requests."""
+
+    def __init__(self, accepted_count: int, total_count: int):
+        self.accepted_count = accepted_count
+        self.total_count = total_count
+        super().__init__(f"HEC request failed after accepting {accepted_count} of {total_count} batched events")
+
+
 class HecEventTooLargeError(HecError):
     """Raised when one event exceeds the configured batch request limit."""
 
@@ -14,6 +14,46 @@
 
 import json
 import logging
+import operator
+import re
+
+from . import _json
+
+_FORMAT_FIELD = re.compile(r"%\(([^)]*)\)")
+_SINGLE_FIELD = re.compile(r"%\(([^)]*)\)s")
+# Attributes every log record has by the time default keys are formatted, so they are read without a default.
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", logging.NOTSET, "", 0, "", None, None))) | {
+    "message",
+    "asctime",
+}
+# Attributes that are always strings, so they are used without str().
+_STR_ATTRIBUTES = frozenset(("levelname", "message", "asctime"))
+
+
+def _default_key_getter(value):
+    """
+    Compiles a default key value into a callable that formats it from a log record.
+
+    Args:
+        value: Default key value.
+
+    Returns:
+        Callable or None: Function taking a log record, or None if the value has no format specifiers.
+    """
+    if not isinstance(value, str) or "%" not in value:
+        return None
+    single_field = _SINGLE_FIELD.fullmatch(value)
+    if single_field is not None:
+        # Exactly one "%(attribute)s" specifier, so the attribute is read without formatting.
+        attribute = single_field.group(1)
+        if attribute in _STR_ATTRIBUTES:
+            return operator.attrgetter(attribute)
+        if attribute in _RECORD_ATTRIBUTES:
+            get_attribute = operator.attrgetter(attribute)
+            return lambda record: str(get_attribute(record))
+        return lambda record: str(getattr(record, attribute, ""))
+    fields = tuple(_FORMAT_FIELD.findall(value))
+    return lambda record: value % {field: getattr(record, field, "") for field in fields}
 
 
 class JsonFormatter(logging.Formatter):
@@ -23,6 +63,8 @@ class JsonFormatter(logging.Formatter):
         datefmt: str | None = None,
         prune_keys: bool = True,
         serializer_args: dict | None = None,
+        compact: bool = False,
+        lean: bool = False,
         **default_keys,
     ):
         """
@@ -37,15 +79,45 @@ class JsonFormatter(logging.Formatter):
                 If True, will prune keys with empty values from the log record (default: True).
             serializer_args (dict, optional):
                 Args that should be passed to `json.dumps`.
+            compact (bool, optional):
+                If True, will serialize log records without whitespace, using orjson when it is installed
+                (default: False).
+            lean (bool, optional):
+                If True, dict messages logged without exception or stack info are merged with the default keys as is,
+                skipping the record time and key pruning. Only applies when no default key is formatted with log
+                record attributes (default: False).
             default_keys:
                 Default keys to be included in every log record. Can be formatted with any log record attribute.
+                Attributes missing from a log record are formatted as empty strings.
         """
         super().__init__(fmt=fmt, datefmt=datefmt)
         self._default_keys = default_keys or {}
+        # (key, value, getter): values are compiled once, and values without format specifiers are used as is.
+        self._default_fields = tuple(
+            (key, value, _default_key_getter(value)) for key, value in self._default_keys.items()
+        )
+        # The record time is only formatted when a default key uses it.
+        self._uses_time = any(
+            "asctime" in _FORMAT_FIELD.findall(value) for value in self._default_keys.values() if isinstance(value, str)
+        )
+        # Default keys as is, or None if a default key needs formatting with a log record.
+        self._static_defaults = None
+        if all(getter is None for _, _, getter in self._default_fields):
+            self._static_defaults = {key: value for key, value, _ in self._default_fields}
+        # Static default keys merged with dict messages in lean mode, or None if a default key needs formatting.
+        self._lean_defaults = self._static_defaults if lean else None
         self._prune_keys = prune_keys
         self._serializer_args = serializer_args or {}
+        self._compact = compact
+        # Dict messages are serialized without format_dict when there are no default keys, unless it is overridden.
+        self._direct_dicts = not self._default_fields and type(self).format_dict is JsonFormatter.format_dict
         return
 
+    @property
+    def serializer_args(self) -> dict:
+        """Args passed to `json.dumps` when log records are serialized."""
+        return self._serializer_args
+
     def format(self, record: logging.LogRecord) -> str:
         """
         Takes a log record and returns a JSON formatted string
@@ -56,26 +128,143 @@ class JsonFormatter(logging.Formatter):
         Returns:
             str: JSON formatted string representing the log record.
         """
+        json_record = self._json_record(record)
+        if self._compact:
+            return _json.dumps(json_record, **self._serializer_args).decode("utf-8")
+        return json.dumps(json_record, **self._serializer_args)
+
+    def format_bytes(self, record: logging.LogRecord) -> bytes:
+        """
+        Takes a log record and returns it as a newline terminated, UTF-8 encoded JSON line.
+
+        Args:
+            record (logging.LogRecord): Log record to format.
+
+        Returns:
+            bytes: JSON line representing the log record.
+        """
+        return self._dumps_line(self._json_record(record))
+
+    def _dumps_line(self, json_record: dict) -> bytes:
+        if self._compact:
+            return _json.dumps_line(json_record, **self._serializer_args)
+        return (json.dumps(json_record, **self._serializer_args) + "\n").encode("utf-8")
+
+    def format_fields(self, fields: dict) -> bytes | None:
+        """
+        Takes dict message fields and returns the JSON line `format_bytes` returns for a log record with them as its
+        message, without creating the log record.
+
+        Args:
+            fields (dict): Fields of the dict message.
+
+        Returns:
+            bytes or None: JSON line, or None if a default key is formatted with log record attributes.
+        """
+        static_defaults = self._static_defaults
+        if static_defaults is None:
+            return None
+        if self._lean_defaults is not None:
+            json_record = dict(fields)
+            for key, value in static_defaults.items():
+                json_record.setdefault(key, value)
+            return self._dumps_line(json_record)
+
+        prune_keys = self._prune_keys
+        if not prune_keys:
+            json_record = dict(fields)
+        else:
+            json_record = {}
+            for key, value in fields.items():
+                if value:
+                    json_record[key] = value
+        for key, value in static_defaults.items():
+            if key not in fields and (value or not prune_keys):
+                json_record[key] = value
+        return self._dumps_line(json_record)
+
+    def _json_record(self, record: logging.LogRecord) -> dict:
+        msg = record.msg
+        if (
+            not self._direct_dicts
+            or (type(msg) is not dict and not isinstance(msg, dict))
+            or record.exc_info
+            or record.stack_info
+        ):
+            return self.format_dict(record)
+        # Without default keys the record is the message itself, so it is serialized as is unless it needs pruning.
+        record.message = ""
+        if not self._prune_keys or self._lean_defaults is not None:
+            return msg
+        json_record = {}
+        for key, value in msg.items():
+            if value:
+                json_record[key] = value
+        return json_record
+
+    def format_dict(self, record: logging.LogRecord) -> dict:
+        """
+        Takes a log record and returns the dict that `format` serializes.
+
+        Args:
+            record (logging.LogRecord): Log record to format.
+
+        Returns:
+            dict: JSON serializable dict representing the log record.
+        """
+        # Messages are either dicts, which are merged into the record, or anything else, which is formatted with
+        # getMessage. The type is checked once, with the exact type test first since plain dicts are the common case.
+        msg = record.msg
+        if type(msg) is not dict and not isinstance(msg, dict):
+            msg = None
+
+        lean_defaults = self._lean_defaults
+        if lean_defaults is not None and msg is not None and not record.exc_info and not record.stack_info:
+            json_record = dict(msg)
+            for key, value in lean_defaults.items():
+                json_record.setdefault(key, value)
+            return json_record
+
         json_record = {}
-        record.asctime = self.formatTime(record, self.datefmt)
+        prune_keys = self._prune_keys
+        if self._uses_time:
+            record.asctime = self.formatTime(record, self.datefmt)
 
         if record.exc_info:
-            json_record["exception"] = self.formatException(record.exc_info)
+            # Cached on the record like logging.Formatter does, so the traceback is only formatted once per record.
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            exception = record.exc_text
+            if exception or not prune_keys:
+                json_record["exception"] = exception
 
         if record.stack_info:
-            json_record["stack"] = self.formatStack(record.stack_info)
+            stack = self.formatStack(record.stack_info)
+            if stack or not prune_keys:
+                json_record["stack"] = stack
 
-        if isinstance(record.msg, dict):
-            json_record.update(**record.msg)
+        if msg is not None:
             record.message = ""
+            if prune_keys:
+                # Empty values are never inserted, and still replace an exception or stack with the same key.
+                for key, value in msg.items():
+                    if value:
+                        json_record[key] = value
+                    else:
+                        json_record.pop(key, None)
+            else:
+                json_record.update(msg)
         else:
-            record.message = record.getMessage()
+            # getMessage only formats with args and converts to str, so plain strings without args are used as is.
+            message = record.msg
+            record.message = message if type(message) is str and not record.args else record.getMessage()
 
-        for k, v in self._default_keys.items():
-            if k not in json_record:
-                json_record[k] = v % record.__dict__
+        for key, value, getter in self._default_fields:
+            if key in json_record or (msg is not None and key in msg):
+                continue
+            if getter is not None:
+                value = getter(record)
+            if value or not prune_keys:
+                json_record[key] = value
 
-        if self._prune_keys:
-            json_record = {k: v for k, v in json_record.items() if v}
-
-        return json.dumps(json_record, **self._serializer_args)
+        return json_record
@@ -12,34 +12,88 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import abc
+import asyncio
+import atexit
+import functools
 import json
+import math
 import queue
 import random
 import socket
 import threading
 import time
 import uuid
-from collections.abc import Callable
+import zlib
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Self
 
 import httpx
-from dateutil.parser import isoparse
 
+from . import _json
 from .exceptions import (
     HecAckError,
     HecAckTimeoutError,
     HecBatchError,
     HecEventTooLargeError,
+    HecPartialDeliveryError,
     HecQueueFullError,
     HecWorkerError,
 )
 
+# Template gzip stream (wbits=31) at level 1, copied for each compressed request instead of being rebuilt.
+_GZIP_COMPRESSOR = zlib.compressobj(1, zlib.DEFLATED, 31)
+
+
+def _finite_timestamp(timeinfo: float) -> float:
+    if not math.isfinite(timeinfo):
+        raise ValueError(f"Invalid timestamp: {timeinfo}")
+    return timeinfo
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_timestamp_str(timeinfo: str, timefmt: str | None) -> float:
+    # Batched events often share a handful of timestamp strings, so parsed values are cached.
+    if timefmt:
+        return datetime.strptime(timeinfo, timefmt).timestamp()
+    try:
+        return datetime.fromisoformat(timeinfo).timestamp()
+    except ValueError:
+        # isoparse accepts a few ISO 8601 forms that fromisoformat rejects. dateutil is slow to import and rarely
+        # needed, so it is only imported here.
+        from dateutil.parser import isoparse
+
+        return isoparse(timeinfo).timestamp()
+
+
+# Exact-type parsers for the common timestamp types, checked before the general isinstance chain.
+_TIMESTAMP_PARSERS = {
+    float: _finite_timestamp,
+    int: float,
+    datetime: datetime.timestamp,
+}
+
+
+# The batch worker is a daemon thread, so forwarders that are still open at exit are closed to deliver their
+# queued events. The worker thread keeps its forwarder alive until it is closed anyway, so forwarders are held
+# strongly and discarded on close.
+_open_batch_forwarders = set()
+
+
+@atexit.register
+def _close_batch_forwarders():
+    for forwarder in list(_open_batch_forwarders):
+        try:
+            forwarder.close()
+        except Exception as e:
+            print(f"Exception when closing Splunk forwarder: {e}")
+
 
 @dataclass(frozen=True, slots=True)
 class _QueuedEvent:
-    payload: str
+    payload: bytes
     size: int
 
 
@@ -52,7 +106,7 @@ class _RequestDeadlineExceededError(Exception):
     """Raised internally when an HTTP retry deadline expires."""
 
 
-class HecForwarder:
+class _BaseHecForwarder(abc.ABC):
     _RETRY_STATUS_CODES = frozenset(
         [
             408,  # Request Timeout
@@ -64,6 +118,11 @@ class HecForwarder:
         ]
     )
     _RETRY_CONNECTION_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+    # Every request goes to the same HEC endpoint, so idle connections are kept for reuse.
+    _POOL_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=32, keepalive_expiry=60.0)
+    _TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+    # Smaller payloads don't shrink enough to be worth the compression cost.
+    _COMPRESS_MIN_BYTES = 1024
 
     def __init__(
         self,
@@ -81,9 +140,15 @@ class HecForwarder:
         channel_id: str | None = None,
         ack_poll_interval: float = 10.0,
         ack_timeout: float = 300.0,
+        batch_size: int = 500,
+        max_batch_bytes: int = 1_048_576,
+        max_retries: int = 3,
+        backoff_factor: float = 1.0,
+        http2: bool = False,
+        compress: bool = False,
     ):
         """
-        Initializes a HecForwarder instance for sending events to a Splunk HEC listener.
+        Initializes a forwarder instance for sending events to a Splunk HEC listener.
 
         Args:
             host (str):
@@ -112,87 +177,92 @@ class HecForwarder:
                 Seconds to wait between acknowledgment queries. (default: 10)
             ack_timeout (float, optional):
                 Seconds to wait for an acknowledgment before raising. (default: 300)
+            batch_size (int, optional):
+                Maximum events per request sent by `forward_events`. (default: 500)
+            max_batch_bytes (int, optional):
+                Maximum serialized bytes per request sent by `forward_events`. (default: 1048576)
+            max_retries (int, optional):
+                Maximum retries of a request that failed with a retryable error. (default: 3)
+            backoff_factor (float, optional):
+                Base delay in seconds between retries, doubled after each attempt. (default: 1)
+            http2 (bool, optional):
+                Whether to connect with HTTP/2. Requires the `http2` extra. (default: False)
+            compress (bool, optional):
+                Whether to gzip batch requests larger than 1 KiB sent by `forward_events`. (default: False)
         """
+        for name, value in {"batch_size": batch_size, "max_batch_bytes": max_batch_bytes}.items():
+            if value <= 0:
+                raise ValueError(f"{name} must be greater than zero")
+        for name, value in {"max_retries": max_retries, "backoff_factor": backoff_factor}.items():
+            if value < 0:
+                raise ValueError(f"{name} cannot be negative")
+
         self._host = host
         self._port = port
         self._token = token or ""
         self._use_ssl = use_ssl
         self._verify_ssl = verify_ssl
+        self._http2 = http2
         self._default_host = default_host or socket.gethostname()
         self._default_source = default_source or ""
         self._default_sourcetype = default_sourcetype or ""
         self._default_index = default_index or ""
+        # Default fields are the same for every event without overrides, so they are only serialized once.
+        default_fields = {
+            "host": self._default_host,
+            "source": self._default_source,
+            "sourcetype": self._default_sourcetype,
+            "index": self._default_index,
+        }
+        default_fields_json = _json.dumps({key: value for key, value in default_fields.items() if value})[1:-1]
+        self._default_fields_json = b"," + default_fields_json if default_fields_json else b""
         if channel_id is not None:
             uuid.UUID(channel_id)
         self._channel_id = channel_id or str(uuid.uuid4())
+        # The channel is fixed for the forwarder's lifetime, so request headers are only built once.
+        self._channel_headers = {"X-Splunk-Request-Channel": self._channel_id}
+        self._payload_headers = {"Content-Type": "application/json", **self._channel_headers}
+        self._gzip_headers = {**self._payload_headers, "Content-Encoding": "gzip"}
+        self._compress = compress
         self._indexer_ack = indexer_ack
         self._ack_poll_interval = ack_poll_interval
         self._ack_timeout = ack_timeout
-        self._backoff_factor = 1
-        self._max_retries = 3
+        self._batch_size = batch_size
+        self._max_batch_bytes = max_batch_bytes
+        self._backoff_factor = backoff_factor
+        self._max_retries = max_retries
 
         self._client = self._create_client()
         return
 
-    def __enter__(self) -> Self:
-        return self
+    @abc.abstractmethod
+    def _create_client(self) -> httpx.Client | httpx.AsyncClient:
+        """Returns the HTTP client requests are sent with."""
 
-    def __exit__(self, exc_type, exc_value, traceback):
-        self.close()
-
-    def close(self):
-        self._client.close()
-
-    def _create_client(self) -> httpx.Client:
+    def _client_args(self) -> dict:
         scheme = "https" if self._use_ssl else "http"
-        return httpx.Client(
-            base_url=httpx.URL(scheme=scheme, host=self._host, port=self._port),
-            verify=self._verify_ssl,
-            headers={"Authorization": f"Splunk {self._token}"},
-        )
-
-    def _request(
-        self,
-        method: str,
-        path: str,
-        *,
-        deadline: float | None = None,
-        **kwargs,
-    ) -> httpx.Response:
-        retry_attempt = 0
-        while True:
-            request_kwargs = kwargs
-            if deadline is not None:
-                remaining = deadline - time.monotonic()
-                if remaining <= 0:
-                    raise _RequestDeadlineExceededError
-                request_kwargs = dict(kwargs)
-                request_kwargs.setdefault("timeout", self._timeout_capped_by(remaining))
-
-            try:
-                response = self._client.request(method, path, **request_kwargs)
-            except self._RETRY_CONNECTION_ERRORS:
-                if retry_attempt >= self._max_retries:
-                    raise
-                self._sleep_before_retry(retry_attempt, deadline=deadline)
-                retry_attempt += 1
-                continue
-
-            if deadline is not None and time.monotonic() >= deadline:
-                raise _RequestDeadlineExceededError
-            if not self._should_retry_response(response):
-                response.raise_for_status()
-                return response
+        return {
+            "base_url": httpx.URL(scheme=scheme, host=self._host, port=self._port),
+            "verify": self._verify_ssl,
+            "headers": {"Authorization": f"Splunk {self._token}"},
+            "http2": self._http2,
+            "limits": self._POOL_LIMITS,
+            "timeout": self._TIMEOUT,
+        }
 
-            if retry_attempt >= self._max_retries:
-                response.raise_for_status()
+    def _request_args(self, kwargs: dict, deadline: float | None) -> dict:
+        if deadline is None:
+            return kwargs
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise _RequestDeadlineExceededError
+        request_kwargs = dict(kwargs)
+        request_kwargs.setdefault("timeout", self._timeout_capped_by(remaining))
+        return request_kwargs
 
-            self._sleep_before_retry(
-                retry_attempt,
-                deadline=deadline,
-                retry_after=response.headers.get("Retry-After"),
-            )
-            retry_attempt += 1
+    def _check_deadline(self, deadline: float | None):
+        if deadline is not None and time.monotonic() >= deadline:
+            raise _RequestDeadlineExceededError
 
     def _should_retry_response(self, response: httpx.Response) -> bool:
         if response.status_code in self._RETRY_STATUS_CODES:
@@ -205,13 +275,13 @@ class HecForwarder:
         except (AttributeError, TypeError, ValueError):
             return False
 
-    def _sleep_before_retry(
+    def _retry_delay(
         self,
         retry_attempt: int,
         *,
         deadline: float | None,
         retry_after: str | None = None,
-    ):
+    ) -> float:
         try:
             delay = float(retry_after) if retry_after is not None else None
         except ValueError:
@@ -225,10 +295,7 @@ class HecForwarder:
             if remaining <= 0:
                 raise _RequestDeadlineExceededError
             delay = min(delay, remaining)
-
-        time.sleep(delay)
-        if deadline is not None and time.monotonic() >= deadline:
-            raise _RequestDeadlineExceededError
+        return delay
 
     def _timeout_capped_by(self, seconds: float) -> httpx.Timeout:
         def cap(value: float | None) -> float:
@@ -256,20 +323,205 @@ class HecForwarder:
         Raises:
             ValueError: If the timestamp parsing has failed.
         """
+        parse = _TIMESTAMP_PARSERS.get(type(timeinfo))
+        if parse is not None:
+            return parse(timeinfo)
+
+        # Subclasses, such as numpy floats or pandas timestamps, are not in the dispatch table.
         if isinstance(timeinfo, datetime):
             timestamp = timeinfo.timestamp()
-        elif type(timeinfo) in [int, float]:
-            # parsing and reconverting ensures we have a valid timestamp
-            timestamp = datetime.fromtimestamp(timeinfo).timestamp()
-        elif type(timeinfo) is str:
-            if timefmt:
-                timestamp = datetime.strptime(timeinfo, timefmt).timestamp()
-            else:
-                timestamp = isoparse(timeinfo).timestamp()
+        elif isinstance(timeinfo, (int, float)) and not isinstance(timeinfo, bool):
+            timestamp = float(timeinfo)
+            if not math.isfinite(timestamp):
+                raise ValueError(f"Invalid timestamp: {timeinfo}")
+        elif isinstance(timeinfo, str):
+            timestamp = _parse_timestamp_str(timeinfo, timefmt or None)
         else:
             raise ValueError(f"Invalid timestamp: {timeinfo}")
         return timestamp
 
+    def _ack_id(self, response: httpx.Response) -> int:
+        try:
+            response_data = response.json()
+            ack_id = response_data.get("ackId", response_data.get("ackID"))
+        except (AttributeError, TypeError, ValueError) as error:
+            raise HecAckError("HEC returned an invalid acknowledgment response") from error
+        if ack_id is None:
+            raise HecAckError("HEC response did not include an acknowledgment ID")
+        try:
+            return int(ack_id)
+        except (TypeError, ValueError) as error:
+            raise HecAckError(f"HEC returned an invalid acknowledgment ID: {ack_id!r}") from error
+
+    def _ack_error(self, error: Exception, ack_ids: list[int], deadline: float) -> HecAckError:
+        if isinstance(error, _RequestDeadlineExceededError) or time.monotonic() >= deadline:
+            return HecAckTimeoutError(f"Timed out waiting for acknowledgments: {ack_ids}")
+        return HecAckError(f"Failed to query HEC acknowledgments: {ack_ids}")
+
+    def _acknowledged(self, response: httpx.Response, ack_ids: list[int]) -> bool:
+        try:
+            ack_statuses = response.json()["acks"]
+            statuses = [ack_statuses[str(ack_id)] for ack_id in ack_ids]
+        except (KeyError, TypeError, ValueError) as error:
+            raise HecAckError("HEC returned an invalid acknowledgment response") from error
+        return all(statuses)
+
+    def _ack_poll_delay(self, ack_ids: list[int], deadline: float) -> float:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise HecAckTimeoutError(f"Timed out waiting for acknowledgments: {ack_ids}")
+        return min(self._ack_poll_interval, remaining)
+
+    def _build_hec_event(
+        self,
+        event: dict,
+        eventtime: str | int | float | datetime | None = None,
+        timefmt: str | None = None,
+        **kwargs,
+    ) -> dict:
+        host = kwargs.get("host", self._default_host)
+        source = kwargs.get("source", self._default_source)
+        sourcetype = kwargs.get("sourcetype", self._default_sourcetype)
+        index = kwargs.get("index", self._default_index)
+
+        hec_event = {}
+        hec_event["event"] = event
+
+        if host:
+            hec_event["host"] = host
+        if source:
+            hec_event["source"] = source
+        if sourcetype:
+            hec_event["sourcetype"] = sourcetype
+        if index:
+            hec_event["index"] = index
+
+        hec_event["time"] = str(self._event_timestamp(eventtime, timefmt))
+        return hec_event
+
+    def _event_timestamp(self, eventtime: str | int | float | datetime | None, timefmt: str | None) -> float:
+        # Events without a time are stamped with time.time() directly rather than through a datetime.
+        return self._parse_timestamp(eventtime, timefmt=timefmt) if eventtime else time.time()
+
+    def _encode_hec_event(
+        self,
+        event: dict,
+        eventtime: str | int | float | datetime | None = None,
+        timefmt: str | None = None,
+        **kwargs,
+    ) -> bytes:
+        """Returns the serialized HEC envelope of an event, the same as serializing `_build_hec_event`."""
+        if kwargs:
+            return self._serialize_hec_event(self._build_hec_event(event, eventtime, timefmt, **kwargs))
+        timestamp = str(self._event_timestamp(eventtime, timefmt)).encode("ascii")
+        return b"".join((b'{"event":', _json.dumps(event), self._default_fields_json, b',"time":"', timestamp, b'"}'))
+
+    def _split_batches(self, payloads: list[bytes]) -> Iterator[tuple[list[bytes], int]]:
+        """
+        Group serialized events into batches bounded by batch_size and max_batch_bytes, yielding each batch with the
+        offset of its first event.
+        """
+        batch = []
+        batch_bytes = 0
+        event_offset = 0
+        for payload in payloads:
+            payload_size = len(payload)
+            if batch and (len(batch) >= self._batch_size or batch_bytes + payload_size > self._max_batch_bytes):
+                yield batch, event_offset
+                event_offset += len(batch)
+                batch = []
+                batch_bytes = 0
+            batch.append(payload)
+            batch_bytes += payload_size
+        if batch:
+            yield batch, event_offset
+
+    def _serialize_hec_event(self, hec_event: dict) -> bytes:
+        return _json.dumps(hec_event)
+
+    def _encode_payload(self, payload: bytes) -> tuple[bytes, dict]:
+        """Returns the request body and headers for a batch payload, gzipping it when compression is enabled."""
+        if not self._compress or len(payload) <= self._COMPRESS_MIN_BYTES:
+            return payload, self._payload_headers
+        compressor = _GZIP_COMPRESSOR.copy()
+        return compressor.compress(payload) + compressor.flush(), self._gzip_headers
+
+    def _batch_error(
+        self,
+        error: httpx.HTTPStatusError,
+        *,
+        event_count: int,
+        event_offset: int,
+        total_count: int,
+    ) -> HecBatchError | None:
+        """Returns the HecBatchError describing a rejected batch request, or None if it cannot be described."""
+        try:
+            invalid_event_number = int(error.response.json()["invalid-event-number"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if not 0 <= invalid_event_number < event_count:
+            return None
+        return HecBatchError(event_offset + invalid_event_number, total_count, error.response)
+
+
+class HecForwarder(_BaseHecForwarder):
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._client.close()
+
+    def _create_client(self) -> httpx.Client:
+        return httpx.Client(**self._client_args())
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        deadline: float | None = None,
+        **kwargs,
+    ) -> httpx.Response:
+        retry_attempt = 0
+        while True:
+            request_kwargs = self._request_args(kwargs, deadline)
+            try:
+                response = self._client.request(method, path, **request_kwargs)
+            except self._RETRY_CONNECTION_ERRORS:
+                if retry_attempt >= self._max_retries:
+                    raise
+                self._sleep_before_retry(retry_attempt, deadline=deadline)
+                retry_attempt += 1
+                continue
+
+            self._check_deadline(deadline)
+            if not self._should_retry_response(response):
+                response.raise_for_status()
+                return response
+
+            if retry_attempt >= self._max_retries:
+                response.raise_for_status()
+
+            self._sleep_before_retry(
+                retry_attempt,
+                deadline=deadline,
+                retry_after=response.headers.get("Retry-After"),
+            )
+            retry_attempt += 1
+
+    def _sleep_before_retry(
+        self,
+        retry_attempt: int,
+        *,
+        deadline: float | None,
+        retry_after: str | None = None,
+    ):
+        time.sleep(self._retry_delay(retry_attempt, deadline=deadline, retry_after=retry_after))
+        self._check_deadline(deadline)
+
     def forward_event(
         self,
         event: dict,
@@ -284,7 +536,7 @@ class HecForwarder:
             event (dict):
                 JSON serializable event to forward
             eventtime (str, int, float, datetime, optional):
-                Time of the event. Should be a valid timestamp or datetime object. (default: datetime.now())
+                Time of the event. Should be a valid timestamp or datetime object. (default: time.time())
             timefmt (str, optional):
                 If eventtime is a string, this is the format to use to parse the eventtime string.
                 By default, eventtime will be parsed as an isoformatted string.
@@ -303,109 +555,55 @@ class HecForwarder:
                     index to send this event to. This will overwrite the default index configured for this event only
                     (default: default_index)
         """
-        hec_event = self._build_hec_event(event, eventtime=eventtime, timefmt=timefmt, **kwargs)
-
-        headers = self._event_headers()
-
-        response = self._request("POST", "/services/collector/event", headers=headers, json=hec_event)
+        response = self._request(
+            "POST",
+            "/services/collector/event",
+            headers=self._payload_headers,
+            content=self._encode_hec_event(event, eventtime=eventtime, timefmt=timefmt, **kwargs),
+        )
         self._wait_for_ack_if_enabled(response)
         return
 
-    def _event_headers(self) -> dict[str, str]:
-        return {"X-Splunk-Request-Channel": self._channel_id}
-
     def _wait_for_ack_if_enabled(self, response: httpx.Response):
         """Wait for the response's indexer acknowledgment when configured."""
         if not self._indexer_ack:
             return
-
-        try:
-            response_data = response.json()
-            ack_id = response_data.get("ackId", response_data.get("ackID"))
-        except (AttributeError, TypeError, ValueError) as error:
-            raise HecAckError("HEC returned an invalid acknowledgment response") from error
-        if ack_id is None:
-            raise HecAckError("HEC response did not include an acknowledgment ID")
-        try:
-            normalized_ack_id = int(ack_id)
-        except (TypeError, ValueError) as error:
-            raise HecAckError(f"HEC returned an invalid acknowledgment ID: {ack_id!r}") from error
-        self._wait_for_acknowledgments([normalized_ack_id])
+        self._wait_for_acknowledgments([self._ack_id(response)])
 
     def _wait_for_acknowledgments(self, ack_ids: list[int]):
         deadline = time.monotonic() + self._ack_timeout
-        headers = {"X-Splunk-Request-Channel": self._channel_id}
         while True:
             try:
                 response = self._request(
                     "POST",
                     "/services/collector/ack",
-                    headers=headers,
+                    headers=self._channel_headers,
                     json={"acks": ack_ids},
                     deadline=deadline,
                 )
-            except _RequestDeadlineExceededError as error:
-                raise HecAckTimeoutError(f"Timed out waiting for acknowledgments: {ack_ids}") from error
-            except httpx.HTTPError as error:
-                if time.monotonic() >= deadline:
-                    raise HecAckTimeoutError(f"Timed out waiting for acknowledgments: {ack_ids}") from error
-                raise HecAckError(f"Failed to query HEC acknowledgments: {ack_ids}") from error
-            try:
-                ack_statuses = response.json()["acks"]
-                statuses = [ack_statuses[str(ack_id)] for ack_id in ack_ids]
-            except (KeyError, TypeError, ValueError) as error:
-                raise HecAckError("HEC returned an invalid acknowledgment response") from error
-            if all(statuses):
+            except (_RequestDeadlineExceededError, httpx.HTTPError) as error:
+                raise self._ack_error(error, ack_ids, deadline) from error
+            if self._acknowledged(response, ack_ids):
                 return
-            remaining = deadline - time.monotonic()
-            if remaining <= 0:
-                raise HecAckTimeoutError(f"Timed out waiting for acknowledgments: {ack_ids}")
-            time.sleep(min(self._ack_poll_interval, remaining))
-
-    def _build_hec_event(
-        self,
-        event: dict,
-        eventtime: str | int | float | datetime | None = None,
-        timefmt: str | None = None,
-        **kwargs,
-    ) -> dict:
-        eventtime = eventtime or datetime.now()
-        host = kwargs.get("host", self._default_host)
-        source = kwargs.get("source", self._default_source)
-        sourcetype = kwargs.get("sourcetype", self._default_sourcetype)
-        index = kwargs.get("index", self._default_index)
-
-        hec_event = {}
-        hec_event["event"] = event
-
-        if host:
-            hec_event["host"] = host
-        if source:
-            hec_event["source"] = source
-        if sourcetype:
-            hec_event["sourcetype"] = sourcetype
-        if index:
-            hec_event["index"] = index
-
-        hec_event["time"] = str(self._parse_timestamp(eventtime, timefmt=timefmt))
-        return hec_event
+            time.sleep(self._ack_poll_delay(ack_ids, deadline))
 
     def forward_events(
         self,
         events: list[dict],
-        eventtime: Callable = lambda _: datetime.now(),
+        eventtime: Callable | None = None,
         timefmt: str | None = None,
         **kwargs,
     ):
         """
-        Forwards multiple events to Splunk.
+        Forwards multiple events to Splunk. Events are sent using HEC's batch protocol, with each request holding
+        at most `batch_size` events and `max_batch_bytes` serialized bytes.
 
         Args:
             event (dict):
                 JSON serializable event to forward
             eventtime (callable, optional):
                 A callable (func or lambda) that should return an event time if given an event from the list.
-                (default: datetime.now() for all events)
+                (default: current time for all events)
             timefmt (str, optional):
                 If eventtime is a string, this is the format to use to parse the eventtime string.
                 By default, eventtime will be parsed as an isoformatted string.
@@ -427,37 +625,229 @@ class HecForwarder:
         if not events:
             return
 
-        hec_events = [
-            self._build_hec_event(event, eventtime=eventtime(event), timefmt=timefmt, **kwargs) for event in events
+        payloads = [
+            self._encode_hec_event(event, eventtime=eventtime and eventtime(event), timefmt=timefmt, **kwargs)
+            for event in events
         ]
-        self._send_hec_events(hec_events)
+        self._send_hec_payloads(payloads)
         return
 
-    def _send_hec_events(self, hec_events: list[dict]):
-        payload = "".join(self._serialize_hec_event(hec_event) for hec_event in hec_events)
-        self._send_hec_payload(payload, event_count=len(hec_events))
-
-    def _serialize_hec_event(self, hec_event: dict) -> str:
-        return json.dumps(hec_event)
+    def _send_hec_payloads(self, payloads: list[bytes]):
+        for batch, event_offset in self._split_batches(payloads):
+            try:
+                self._send_hec_payload(
+                    b"".join(batch),
+                    event_count=len(batch),
+                    event_offset=event_offset,
+                    total_count=len(payloads),
+                )
+            except HecBatchError:
+                raise
+            except Exception as error:
+                if not event_offset:
+                    raise
+                raise HecPartialDeliveryError(event_offset, len(payloads)) from error
 
-    def _send_hec_payload(self, payload: str, *, event_count: int):
-        headers = {
-            "Content-Type": "application/json",
-            **self._event_headers(),
-        }
+    def _send_hec_payload(
+        self,
+        payload: bytes,
+        *,
+        event_count: int,
+        event_offset: int = 0,
+        total_count: int | None = None,
+    ):
+        content, headers = self._encode_payload(payload)
         try:
-            response = self._request("POST", "/services/collector/event", headers=headers, content=payload)
+            response = self._request(
+                "POST",
+                "/services/collector/event",
+                headers=headers,
+                content=content,
+            )
         except httpx.HTTPStatusError as error:
-            try:
-                invalid_event_number = int(error.response.json()["invalid-event-number"])
-            except (KeyError, TypeError, ValueError):
-                raise error
-            if not 0 <= invalid_event_number < event_count:
-                raise error
-            raise HecBatchError(invalid_event_number, event_count, error.response) from error
+            batch_error = self._batch_error(
+                error,
+                event_count=event_count,
+                event_offset=event_offset,
+                total_count=total_count or event_count,
+            )
+            if batch_error is None:
+                raise
+            raise batch_error from error
         self._wait_for_ack_if_enabled(response)
 
 
+class AsyncHecForwarder(_BaseHecForwarder):
+    # One pooled client is shared by concurrent forwarding calls.
+    _POOL_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=64, keepalive_expiry=60.0)
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        await self._client.aclose()
+
+    def _create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(**self._client_args())
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        deadline: float | None = None,
+        **kwargs,
+    ) -> httpx.Response:
+        retry_attempt = 0
+        while True:
+            request_kwargs = self._request_args(kwargs, deadline)
+            try:
+                response = await self._client.request(method, path, **request_kwargs)
+            except self._RETRY_CONNECTION_ERRORS:
+                if retry_attempt >= self._max_retries:
+                    raise
+                await self._sleep_before_retry(retry_attempt, deadline=deadline)
+                retry_attempt += 1
+                continue
+
+            self._check_deadline(deadline)
+            if not self._should_retry_response(response):
+                response.raise_for_status()
+                return response
+
+            if retry_attempt >= self._max_retries:
+                response.raise_for_status()
+
+            await self._sleep_before_retry(
+                retry_attempt,
+                deadline=deadline,
+                retry_after=response.headers.get("Retry-After"),
+            )
+            retry_attempt += 1
+
+    async def _sleep_before_retry(
+        self,
+        retry_attempt: int,
+        *,
+        deadline: float | None,
+        retry_after: str | None = None,
+    ):
+        await asyncio.sleep(self._retry_delay(retry_attempt, deadline=deadline, retry_after=retry_after))
+        self._check_deadline(deadline)
+
+    async def forward_event(
+        self,
+        event: dict,
+        eventtime: str | int | float | datetime | None = None,
+        timefmt: str | None = None,
+        **kwargs,
+    ):
+        """
+        Forwards a single event to Splunk. Takes the same arguments as `HecForwarder.forward_event`.
+
+        Calls can be awaited concurrently, for example with `asyncio.gather`, and share the forwarder's connection
+        pool.
+        """
+        response = await self._request(
+            "POST",
+            "/services/collector/event",
+            headers=self._payload_headers,
+            content=self._encode_hec_event(event, eventtime=eventtime, timefmt=timefmt, **kwargs),
+        )
+        await self._wait_for_ack_if_enabled(response)
+        return
+
+    async def _wait_for_ack_if_enabled(self, response: httpx.Response):
+        """Wait for the response's indexer acknowledgment when configured."""
+        if not self._indexer_ack:
+            return
+        await self._wait_for_acknowledgments([self._ack_id(response)])
+
+    async def _wait_for_acknowledgments(self, ack_ids: list[int]):
+        deadline = time.monotonic() + self._ack_timeout
+        while True:
+            try:
+                response = await self._request(
+                    "POST",
+                    "/services/collector/ack",
+                    headers=self._channel_headers,
+                    json={"acks": ack_ids},
+                    deadline=deadline,
+                )
+            except (_RequestDeadlineExceededError, httpx.HTTPError) as error:
+                raise self._ack_error(error, ack_ids, deadline) from error
+            if self._acknowledged(response, ack_ids):
+                return
+            await asyncio.sleep(self._ack_poll_delay(ack_ids, deadline))
+
+    async def forward_events(
+        self,
+        events: list[dict],
+        eventtime: Callable | None = None,
+        timefmt: str | None = None,
+        **kwargs,
+    ):
+        """
+        Forwards multiple events to Splunk. Takes the same arguments as `HecForwarder.forward_events`.
+
+        Events are sent using HEC's batch protocol, with each request holding at most `batch_size` events and
+        `max_batch_bytes` serialized bytes.
+        """
+        if not events:
+            return
+
+        payloads = [
+            self._encode_hec_event(event, eventtime=eventtime and eventtime(event), timefmt=timefmt, **kwargs)
+            for event in events
+        ]
+        for batch, event_offset in self._split_batches(payloads):
+            try:
+                await self._send_hec_payload(
+                    b"".join(batch),
+                    event_count=len(batch),
+                    event_offset=event_offset,
+                    total_count=len(payloads),
+                )
+            except HecBatchError:
+                raise
+            except Exception as error:
+                if not event_offset:
+                    raise
+                raise HecPartialDeliveryError(event_offset, len(payloads)) from error
+        return
+
+    async def _send_hec_payload(
+        self,
+        payload: bytes,
+        *,
+        event_count: int,
+        event_offset: int = 0,
+        total_count: int | None = None,
+    ):
+        content, headers = self._encode_payload(payload)
+        try:
+            response = await self._request(
+                "POST",
+                "/services/collector/event",
+                headers=headers,
+                content=content,
+            )
+        except httpx.HTTPStatusError as error:
+            batch_error = self._batch_error(
+                error,
+                event_count=event_count,
+                event_offset=event_offset,
+                total_count=total_count or event_count,
+            )
+            if batch_error is None:
+                raise
+            raise batch_error from error
+        await self._wait_for_ack_if_enabled(response)
+
+
 class BatchHecForwarder(HecForwarder):
     def __init__(
         self,
@@ -468,11 +858,10 @@ class BatchHecForwarder(HecForwarder):
         max_queue_size: int = 10_000,
         max_queue_bytes: int = 10_485_760,
         enqueue_timeout: float | None = None,
+        close_at_exit: bool = True,
         **kwargs,
     ):
         limits = {
-            "batch_size": batch_size,
-            "max_batch_bytes": max_batch_bytes,
             "flush_interval": flush_interval,
             "max_queue_size": max_queue_size,
             "max_queue_bytes": max_queue_bytes,
@@ -483,9 +872,7 @@ class BatchHecForwarder(HecForwarder):
         if enqueue_timeout is not None and enqueue_timeout < 0:
             raise ValueError("enqueue_timeout cannot be negative")
 
-        super().__init__(*args, **kwargs)
-        self._batch_size = batch_size
-        self._max_batch_bytes = max_batch_bytes
+        super().__init__(*args, batch_size=batch_size, max_batch_bytes=max_batch_bytes, **kwargs)
         self._flush_interval = flush_interval
         self._max_queue_size = max_queue_size
         self._max_queue_bytes = max_queue_bytes
@@ -502,6 +889,8 @@ class BatchHecForwarder(HecForwarder):
         self._closed = False
         self._worker_thread = threading.Thread(target=self._worker, name="splunk-hec-batch", daemon=True)
         self._worker_thread.start()
+        if close_at_exit:
+            _open_batch_forwarders.add(self)
 
     def forward_event(
         self,
@@ -518,12 +907,13 @@ class BatchHecForwarder(HecForwarder):
     def forward_events(
         self,
         events: list[dict],
-        eventtime: Callable = lambda _: datetime.now(),
+        eventtime: Callable | None = None,
         timefmt: str | None = None,
         **kwargs,
     ):
         queued_events = [
-            self._prepare_queued_event(event, eventtime=eventtime(event), timefmt=timefmt, **kwargs) for event in events
+            self._prepare_queued_event(event, eventtime=eventtime and eventtime(event), timefmt=timefmt, **kwargs)
+            for event in events
         ]
         deadline = None if self._enqueue_timeout is None else time.monotonic() + self._enqueue_timeout
         with self._producer_lock:
@@ -573,9 +963,8 @@ class BatchHecForwarder(HecForwarder):
         timefmt: str | None = None,
         **kwargs,
     ) -> _QueuedEvent:
-        envelope = self._build_hec_event(event, eventtime=eventtime, timefmt=timefmt, **kwargs)
-        payload = self._serialize_hec_event(envelope)
-        event_size = len(payload.encode("utf-8"))
+        payload = self._encode_hec_event(event, eventtime=eventtime, timefmt=timefmt, **kwargs)
+        event_size = len(payload)
         event_limit = min(self._max_batch_bytes, self._max_queue_bytes)
         if event_size > event_limit:
             raise HecEventTooLargeError(event_size, event_limit)
@@ -615,6 +1004,7 @@ class BatchHecForwarder(HecForwarder):
             self._worker_thread.join()
         super().close()
         self._closed = True
+        _open_batch_forwarders.discard(self)
         if delivery_error is not None:
             raise delivery_error
 
@@ -665,7 +1055,7 @@ class BatchHecForwarder(HecForwarder):
 
             try:
                 self._send_hec_payload(
-                    "".join(queued_event.payload for queued_event in batch),
+                    b"".join(queued_event.payload for queued_event in batch),
                     event_count=len(batch),
                 )
             except Exception as error:
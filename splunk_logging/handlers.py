@@ -15,13 +15,19 @@
 import json
 import logging
 import os
-import socket
+import queue
+import threading
+from typing import BinaryIO
 
+from .exceptions import HecQueueFullError
 from .formatters import JsonFormatter
 from .forwarders import BatchHecForwarder, HecForwarder
 
 
 class HecHandler(logging.Handler):
+    # Log record attributes, usually set with `extra`, that override the forwarder's defaults.
+    _OVERRIDES = ("host", "source", "sourcetype", "index")
+
     def __init__(
         self,
         host: str = "localhost",
@@ -39,6 +45,10 @@ class HecHandler(logging.Handler):
         channel_id: str | None = None,
         ack_poll_interval: float = 10.0,
         ack_timeout: float = 300.0,
+        max_retries: int = 3,
+        backoff_factor: float = 1.0,
+        http2: bool = False,
+        compress: bool = False,
         batch_enabled: bool = False,
         batch_size: int = 100,
         max_batch_bytes: int = 1_048_576,
@@ -80,6 +90,14 @@ class HecHandler(logging.Handler):
                 Seconds to wait between acknowledgment queries. (default: 10)
             ack_timeout (float, optional):
                 Seconds to wait for an acknowledgment before raising. (default: 300)
+            max_retries (int, optional):
+                Maximum retries of a request that failed with a retryable error. (default: 3)
+            backoff_factor (float, optional):
+                Base delay in seconds between retries, doubled after each attempt. (default: 1)
+            http2 (bool, optional):
+                Whether to connect with HTTP/2. Requires the `http2` extra. (default: False)
+            compress (bool, optional):
+                Whether to gzip batch requests larger than 1 KiB. (default: False)
             batch_enabled (bool, optional):
                 Queue log records and send them in background batches. (default: False)
             batch_size (int, optional):
@@ -93,11 +111,14 @@ class HecHandler(logging.Handler):
             max_queue_bytes (int, optional):
                 Maximum queued and in-flight serialized bytes. (default: 10485760)
             enqueue_timeout (float, optional):
-                Maximum seconds to wait for queue capacity. (default: wait indefinitely)
+                Maximum seconds to wait for queue capacity. Records that do not fit in time are dropped and counted
+                in `dropped_records`. (default: wait indefinitely)
         """
         super().__init__(**kwargs)
         self.setFormatter(JsonFormatter())
         self._ignore_exceptions = ignore_exceptions
+        self._dropped_records = 0
+        self._reported_failure = None
 
         forwarder_class = BatchHecForwarder if batch_enabled else HecForwarder
         forwarder_kwargs = {
@@ -106,7 +127,7 @@ class HecHandler(logging.Handler):
             "token": token or os.environ.get("HEC_TOKEN", ""),
             "use_ssl": use_ssl,
             "verify_ssl": verify_ssl,
-            "default_host": default_host or socket.gethostname(),
+            "default_host": default_host,
             "default_source": default_source or "",
             "default_sourcetype": default_sourcetype or "",
             "default_index": default_index or "",
@@ -114,6 +135,10 @@ class HecHandler(logging.Handler):
             "channel_id": channel_id,
             "ack_poll_interval": ack_poll_interval,
             "ack_timeout": ack_timeout,
+            "max_retries": max_retries,
+            "backoff_factor": backoff_factor,
+            "http2": http2,
+            "compress": compress,
         }
         if batch_enabled:
             forwarder_kwargs.update(
@@ -123,6 +148,8 @@ class HecHandler(logging.Handler):
                 max_queue_size=max_queue_size,
                 max_queue_bytes=max_queue_bytes,
                 enqueue_timeout=enqueue_timeout,
+                # logging.shutdown closes the handler, and with it the forwarder, at exit.
+                close_at_exit=False,
             )
         self._hec = forwarder_class(**forwarder_kwargs)
 
@@ -142,19 +169,26 @@ class HecHandler(logging.Handler):
         Args:
             record (logging.LogRecord): Log record to send to Splunk via HEC
         """
-        hec_args = {}
-        if hasattr(record, "host"):
-            hec_args["host"] = record.host
-        if hasattr(record, "source"):
-            hec_args["source"] = record.source
-        if hasattr(record, "sourcetype"):
-            hec_args["sourcetype"] = record.sourcetype
-        if hasattr(record, "index"):
-            hec_args["index"] = record.index
-
-        event = json.loads(self.format(record))
+        attributes = record.__dict__
+        hec_args = {key: attributes[key] for key in self._OVERRIDES if key in attributes}
+
+        formatter = self.formatter
+        # The dict is forwarded as is only when format would serialize it unchanged. Serializer args and format
+        # overrides need the formatted string.
+        if (
+            isinstance(formatter, JsonFormatter)
+            and type(formatter).format is JsonFormatter.format
+            and not formatter.serializer_args
+        ):
+            event = formatter.format_dict(record)
+        else:
+            event = json.loads(self.format(record))
         try:
             self._hec.forward_event(event, eventtime=record.created, **hec_args)
+        except HecQueueFullError:
+            self._dropped_records += 1
+            if not self._ignore_exceptions:
+                raise
         except Exception as e:
             if self._ignore_exceptions:
                 print(f"Exception when logging to Splunk: {e}")
@@ -162,6 +196,11 @@ class HecHandler(logging.Handler):
                 raise e
         return
 
+    @property
+    def dropped_records(self) -> int:
+        """Number of log records dropped because the batch queue was full."""
+        return self._dropped_records
+
     def flush(self):
         forwarder = getattr(self, "_hec", None)
         flush = getattr(forwarder, "flush", None)
@@ -171,7 +210,7 @@ class HecHandler(logging.Handler):
             flush()
         except Exception as error:
             if getattr(self, "_ignore_exceptions", True):
-                print(f"Exception when flushing logs to Splunk: {error}")
+                self._report_delivery_error("Exception when flushing logs to Splunk", error)
             else:
                 raise error
 
@@ -186,6 +225,201 @@ class HecHandler(logging.Handler):
         super().close()
         if delivery_error is not None:
             if getattr(self, "_ignore_exceptions", True):
-                print(f"Exception when closing Splunk logging handler: {delivery_error}")
+                self._report_delivery_error("Exception when closing Splunk logging handler", delivery_error)
             else:
                 raise delivery_error
+
+    def _report_delivery_error(self, message: str, error: Exception):
+        # A failed background delivery is raised again by every later flush and close, but only reported once.
+        failure = getattr(error, "cause", error)
+        if failure is self._reported_failure:
+            return
+        self._reported_failure = failure
+        print(f"{message}: {error}")
+
+
+class BytesStreamHandler(logging.StreamHandler):
+    def __init__(self, stream: BinaryIO):
+        """
+        The BytesStreamHandler class writes log records as JSON lines to a binary stream, with one write per record.
+
+        Args:
+            stream (BinaryIO): Binary stream to write log records to, such as `sys.stdout.buffer`.
+        """
+        super().__init__(stream)
+        self.setFormatter(JsonFormatter())
+
+    def emit(self, record: logging.LogRecord):
+        """
+        Writes the log record to the stream, or hands it to the subclass's buffer or writer queue. Records are
+        serialized with `JsonFormatter.format_bytes`, or encoded from `format` when another formatter is set.
+
+        Args:
+            record (logging.LogRecord): Log record to write.
+        """
+        try:
+            self._emit_line(self._format_line(record))
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def _format_line(self, record: logging.LogRecord) -> bytes:
+        formatter = self.formatter
+        # format_bytes only matches format when format isn't overridden.
+        if isinstance(formatter, JsonFormatter) and type(formatter).format is JsonFormatter.format:
+            return formatter.format_bytes(record)
+        return (self.format(record) + self.terminator).encode("utf-8")
+
+    def handle_line(self, line: bytes):
+        """
+        Writes a line that was formatted without a log record, taking the handler lock like `logging.Handler.handle`.
+
+        Args:
+            line (bytes): JSON line to write.
+        """
+        with self.lock:
+            self._emit_line(line)
+
+    def _emit_line(self, line: bytes):
+        self.stream.write(line)
+        self.flush()
+
+
+class BufferedJsonHandler(BytesStreamHandler):
+    def __init__(self, stream: BinaryIO, capacity: int = 65536, flush_interval: float = 0.5):
+        """
+        The BufferedJsonHandler class collects JSON lines in memory and writes them to a binary stream in chunks.
+        The buffer is written when it reaches `capacity` bytes, every `flush_interval` seconds, and on flush or close.
+
+        Args:
+            stream (BinaryIO): Binary stream to write log records to, such as `sys.stdout.buffer`.
+            capacity (int, optional): Buffered bytes that trigger a write. (default: 65536)
+            flush_interval (float, optional): Maximum seconds to hold buffered records. (default: 0.5)
+        """
+        for name, value in {"capacity": capacity, "flush_interval": flush_interval}.items():
+            if value <= 0:
+                raise ValueError(f"{name} must be greater than zero")
+
+        super().__init__(stream)
+        self._capacity = capacity
+        self._flush_interval = flush_interval
+        self._buffer = bytearray()
+        self._stopped = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, name="splunk-json-flush", daemon=True)
+        self._flusher.start()
+
+    def _emit_line(self, line: bytes):
+        self._buffer += line
+        if len(self._buffer) >= self._capacity:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            if self._buffer:
+                # The filled buffer is handed to the stream as is, and records are collected in a new one.
+                buffer, self._buffer = self._buffer, bytearray()
+                self.stream.write(buffer)
+            super().flush()
+
+    def close(self):
+        # The flusher isn't joined, since logging.shutdown holds the handler lock that the flusher may be waiting for.
+        # It stops once it gets the lock.
+        self._stopped.set()
+        try:
+            self.flush()
+        finally:
+            super().close()
+
+    def _flush_periodically(self):
+        while not self._stopped.wait(self._flush_interval):
+            with self.lock:
+                if self._stopped.is_set():
+                    return
+                try:
+                    self.flush()
+                except Exception as error:
+                    print(f"Exception when flushing logs: {error}")
+
+
+class ThreadedJsonHandler(BytesStreamHandler):
+    def __init__(self, stream: BinaryIO):
+        """
+        The ThreadedJsonHandler class formats log records on the logging thread without taking the handler lock,
+        and hands the JSON lines to a background thread that writes them to a binary stream. Lines queued while a
+        write is in progress are joined into the next write.
+
+        Args:
+            stream (BinaryIO): Binary stream to write log records to, such as `sys.stdout.buffer`.
+        """
+        super().__init__(stream)
+        self._queue = queue.SimpleQueue()
+        self._stop = object()
+        self._writer = threading.Thread(target=self._write_lines, name="splunk-json-writer", daemon=True)
+        self._writer.start()
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        """
+        Filters and emits the log record. Unlike `logging.Handler.handle`, the handler lock is not acquired, since
+        records are only formatted and queued.
+        """
+        result = self.filter(record)
+        if isinstance(result, logging.LogRecord):
+            record = result
+        if result:
+            self.emit(record)
+        return result
+
+    def handle_line(self, line: bytes):
+        """Queues a line that was formatted without a log record, without taking the handler lock."""
+        self._emit_line(line)
+
+    def _emit_line(self, line: bytes):
+        self._queue.put(line)
+
+    def flush(self):
+        """Waits until the records queued so far are written to the stream."""
+        if not self._writer.is_alive():
+            super().flush()
+            return
+        written = threading.Event()
+        self._queue.put(written)
+        written.wait()
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(self._stop)
+            self._writer.join()
+        super().close()
+
+    def _write_lines(self):
+        while True:
+            lines = []
+            flush_requests = []
+            stop = False
+            item = self._queue.get()
+            while True:
+                if item is self._stop:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    flush_requests.append(item)
+                else:
+                    lines.append(item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if lines:
+                # The writer is the only thread writing to the stream, so the handler lock isn't taken. Waiting for it
+                # would deadlock with logging.shutdown, which holds it while flush and close wait for the writer.
+                try:
+                    self.stream.write(b"".join(lines))
+                    if hasattr(self.stream, "flush"):
+                        self.stream.flush()
+                except Exception as error:
+                    print(f"Exception when writing logs: {error}")
+            for flush_request in flush_requests:
+                flush_request.set()
+            if stop:
+                return
@@ -0,0 +1,117 @@
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+
+from .formatters import JsonFormatter
+from .handlers import BytesStreamHandler
+
+
+class StructuredLogger:
+    def __init__(self, logger: logging.Logger | str | None = None):
+        """
+        The StructuredLogger class logs keyword fields as dict messages. When every handler of the logger is a
+        `BytesStreamHandler` with a `JsonFormatter` whose default keys aren't formatted with log record attributes,
+        and no filters are set, the fields are formatted and written without creating a log record. Otherwise they are
+        logged with the wrapped logger.
+
+        Args:
+            logger (logging.Logger | str, optional): Logger, or name of the logger, to log with. (default: root logger)
+        """
+        if not isinstance(logger, logging.Logger):
+            logger = logging.getLogger(logger)
+        self.logger = logger
+
+    def debug(self, **fields):
+        """Logs the fields with level DEBUG."""
+        self._log(logging.DEBUG, fields)
+
+    def info(self, **fields):
+        """Logs the fields with level INFO."""
+        self._log(logging.INFO, fields)
+
+    def warning(self, **fields):
+        """Logs the fields with level WARNING."""
+        self._log(logging.WARNING, fields)
+
+    def error(self, **fields):
+        """Logs the fields with level ERROR."""
+        self._log(logging.ERROR, fields)
+
+    def critical(self, **fields):
+        """Logs the fields with level CRITICAL."""
+        self._log(logging.CRITICAL, fields)
+
+    def log(self, level: int, **fields):
+        """
+        Logs the fields with the given level.
+
+        Args:
+            level (int): Log level.
+            fields: Fields of the logged dict message.
+        """
+        self._log(level, fields)
+
+    def _log(self, level: int, fields: dict):
+        logger = self.logger
+        if not logger.isEnabledFor(level):
+            return
+        lines = self._format_lines(level, fields)
+        if lines is None:
+            # stacklevel points the record at the caller of the level method.
+            logger.log(level, fields, stacklevel=3)
+            return
+        for handler, line in lines:
+            try:
+                handler.handle_line(line)
+            except RecursionError:
+                raise
+            except Exception:
+                handler.handleError(
+                    logging.makeLogRecord(
+                        {"name": logger.name, "msg": fields, "levelno": level, "levelname": logging.getLevelName(level)}
+                    )
+                )
+
+    def _format_lines(self, level: int, fields: dict) -> list[tuple[BytesStreamHandler, bytes]] | None:
+        # Returns the lines to write for each handler the record would reach, or None if a log record is needed.
+        logger = self.logger
+        if logger.filters:
+            return None
+        lines = []
+        formatted = {}
+        found = False
+        while logger is not None:
+            for handler in logger.handlers:
+                found = True
+                if level < handler.level:
+                    continue
+                formatter = handler.formatter
+                if (
+                    not isinstance(handler, BytesStreamHandler)
+                    or handler.filters
+                    or type(formatter) is not JsonFormatter
+                ):
+                    return None
+                line = formatted.get(id(formatter))
+                if line is None:
+                    line = formatted[id(formatter)] = formatter.format_fields(fields)
+                    if line is None:
+                        return None
+                lines.append((handler, line))
+            if not logger.propagate:
+                break
+            logger = logger.parent
+        # Without handlers, records go to logging.lastResort.
+        return lines if found else None
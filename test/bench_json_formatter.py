@@ -0,0 +1,95 @@
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measures the per-record cost of JsonFormatter through a logger, without the handler lock.
+
+Run from the repository root with `PYTHONPATH=. python test/bench_json_formatter.py`. Not collected by unittest discovery.
+"""
+
+import argparse
+import io
+import logging
+import timeit
+
+from splunk_logging.formatters import JsonFormatter
+from splunk_logging.handlers import BytesStreamHandler
+from splunk_logging.loggers import StructuredLogger
+
+
+class NoLockStreamHandler(logging.StreamHandler):
+    """StreamHandler that emits without acquiring the handler lock, for single-threaded benchmarks only."""
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        result = self.filter(record)
+        if isinstance(result, logging.LogRecord):
+            record = result
+        if result:
+            self.emit(record)
+        return result
+
+
+class NoLockBytesStreamHandler(NoLockStreamHandler, BytesStreamHandler):
+    """BytesStreamHandler that emits without acquiring the handler lock, for single-threaded benchmarks only."""
+
+
+FORMATTERS = {
+    "empty": {},
+    "format": {"level": "%(levelname)s", "name": "%(name)s", "message": "%(message)s"},
+    "format_prune": {"level": "%(levelname)s", "name": "%(name)s", "message": "%(message)s", "prune_keys": False},
+    "static": {"app": "api", "env": "production"},
+    "lean": {"app": "api", "env": "production", "lean": True},
+}
+
+MESSAGES = {
+    "dict": {"a": 1, "b": 2, "c": "", "user": "admin", "path": "/api/v1/items"},
+    "str": "hello world",
+}
+
+
+def create_logger(formatter: JsonFormatter, binary: bool) -> logging.Logger:
+    log = logging.Logger("root")
+    handler = NoLockBytesStreamHandler(io.BytesIO()) if binary else NoLockStreamHandler(io.StringIO())
+    handler.setFormatter(formatter)
+    # The sink is never read, so it is emptied instead of growing for the whole run.
+    handler.flush = lambda: (handler.stream.seek(0), handler.stream.truncate())
+    log.addHandler(handler)
+    return log
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=100_000, help="records per measurement")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="measurements per case, the best is reported")
+    args = parser.parse_args()
+
+    for formatter_name, formatter_args in FORMATTERS.items():
+        for compact in (False, True):
+            for binary in (False, True):
+                log = create_logger(JsonFormatter(compact=compact, **formatter_args), binary)
+                for message_name, message in MESSAGES.items():
+                    best = min(timeit.repeat(lambda: log.info(message), number=args.number, repeat=args.repeat))
+                    case = f"{formatter_name} compact={compact} binary={binary} {message_name}"
+                    print(f"{case:<48} {best / args.number * 1e9:>8.0f} ns/record")
+
+                if binary and "%" not in str(formatter_args):
+                    structured = StructuredLogger(log)
+                    fields = MESSAGES["dict"]
+                    best = min(timeit.repeat(lambda: structured.info(**fields), number=args.number, repeat=args.repeat))
+                    case = f"{formatter_name} compact={compact} structured"
+                    print(f"{case:<48} {best / args.number * 1e9:>8.0f} ns/record")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,17 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import gzip
 import json
 import random
 import threading
 import unittest
+import uuid
 from datetime import datetime
 from unittest.mock import patch
 
 import httpx
 import respx
 
-from splunk_logging.forwarders import HecForwarder
+from splunk_logging.forwarders import AsyncHecForwarder, HecForwarder, _parse_timestamp_str
 
 TEST_CHANNEL_ID = "00000000-0000-4000-8000-000000000001"
 
@@ -48,6 +51,17 @@ class TestHecForwarder(unittest.TestCase):
             hec.forward_event(event)
         return
 
+    @patch("splunk_logging.forwarders.httpx.Client")
+    def test_client_options(self, client):
+        HecForwarder(host="localhost", port=8088, token="", use_ssl=False, http2=True)
+
+        args = client.call_args.kwargs
+        self.assertTrue(args["http2"])
+        self.assertEqual(args["limits"].max_keepalive_connections, 32)
+        self.assertEqual(args["limits"].keepalive_expiry, 60.0)
+        self.assertEqual(args["timeout"], httpx.Timeout(10.0, connect=5.0))
+        return
+
     @respx.mock
     def test_forward_event_preserves_channel_header_without_ack_polling(self):
         hec = HecForwarder(
@@ -88,6 +102,17 @@ class TestHecForwarder(unittest.TestCase):
         self.assertEqual(first["time"], str(event_times["first"].timestamp()))
         self.assertEqual(second["time"], str(event_times["second"].timestamp()))
 
+    @respx.mock
+    @patch("splunk_logging.forwarders.time.time", return_value=1767268800.5)
+    def test_forward_events_defaults_to_current_time(self, _time):
+        hec = self.create_forwarder()
+        route = respx.post("http://localhost:8088/services/collector/event")
+        route.return_value = httpx.Response(200, json={"text": "Success", "code": 0})
+
+        hec.forward_events([{"message": "first"}])
+
+        self.assertEqual(json.loads(route.calls.last.request.content)["time"], "1767268800.5")
+
     @respx.mock
     def test_forward_events_with_no_events_sends_no_request(self):
         hec = self.create_forwarder()
@@ -115,6 +140,94 @@ class TestHecForwarder(unittest.TestCase):
         self.assertEqual(raised.exception.accepted_count, 1)
         self.assertEqual(raised.exception.total_count, 3)
 
+    @respx.mock
+    def test_forward_events_splits_requests_at_batch_limits(self):
+        route = respx.post("http://localhost:8088/services/collector/event")
+        route.return_value = httpx.Response(200, json={"text": "Success", "code": 0})
+
+        for options, expected_calls in (({"batch_size": 2}, 3), ({"max_batch_bytes": 700}, 5)):
+            with self.subTest(options=options):
+                hec = HecForwarder(host="localhost", port=8088, token="", use_ssl=False, **options)
+                previous_call_count = route.call_count
+
+                hec.forward_events([{"message": "x" * 500} for _ in range(5)])
+
+                self.assertEqual(route.call_count, previous_call_count + expected_calls)
+                hec.close()
+
+    @respx.mock
+    def test_forward_events_compresses_large_requests(self):
+        hec = HecForwarder(host="localhost", port=8088, token="", use_ssl=False, compress=True)
+        route = respx.post("http://localhost:8088/services/collector/event")
+        route.return_value = httpx.Response(200, json={"text": "Success", "code": 0})
+
+        hec.forward_events([{"message": "small"}])
+        hec.forward_events([{"message": "x" * 500} for _ in range(5)])
+        hec.forward_events([{"message": "y" * 500} for _ in range(5)])
+
+        self.assertNotIn("Content-Encoding", route.calls[0].request.headers)
+        self.assertEqual(json.loads(route.calls[0].request.content)["event"], {"message": "small"})
+        for call, char in zip(route.calls[1:], "xy"):
+            self.assertEqual(call.request.headers["Content-Encoding"], "gzip")
+            content = gzip.decompress(call.request.content).decode("utf-8")
+            event, _ = json.JSONDecoder().raw_decode(content)
+            self.assertEqual(event["event"], {"message": char * 500})
+        hec.close()
+
+    @respx.mock
+    def test_generated_channel_is_reused_across_requests(self):
+        hec = HecForwarder(host="localhost", port=8088, token="", use_ssl=False, batch_size=2)
+        route = respx.post("http://localhost:8088/services/collector/event")
+        route.return_value = httpx.Response(200, json={"text": "Success", "code": 0})
+
+        hec.forward_event({"message": "single"})
+        hec.forward_events([{"message": str(index)} for index in range(4)])
+
+        channels = {call.request.headers["X-Splunk-Request-Channel"] for call in route.calls}
+        self.assertEqual(route.call_count, 3)
+        self.assertEqual(len(channels), 1)
+        self.assertEqual(uuid.UUID(channels.pop()).version, 4)
+        hec.close()
+
+    @respx.mock
+    def test_forward_events_reports_acceptance_across_requests(self):
+        from splunk_logging.exceptions import HecBatchError
+
+        hec = HecForwarder(host="localhost", port=8088, token="", use_ssl=False, batch_size=2)
+        route = respx.post("http://localhost:8088/services/collector/event")
+        route.side_effect = [
+            httpx.Response(200, json={"text": "Success", "code": 0}),
+            httpx.Response(400, json={"text": "Incorrect data format", "code": 5, "invalid-event-number": 1}),
+        ]
+
+        with self.assertRaises(HecBatchError) as raised:
+            hec.forward_events([{"message": str(index)} for index in range(4)])
+
+        self.assertEqual(raised.exception.accepted_count, 3)
+        self.assertEqual(raised.exception.total_count, 4)
+
+    @respx.mock
+    @patch("splunk_logging.forwarders.time.sleep")
+    def test_forward_events_reports_acceptance_before_later_request_failures(self, _sleep):
+        from splunk_logging.exceptions import HecPartialDeliveryError
+
+        for failure, cause in (
+            (httpx.Response(500, json={"text": "Internal server error", "code": 8}), httpx.HTTPStatusError),
+            (httpx.ConnectError("connection refused"), httpx.ConnectError),
+        ):
+            with self.subTest(cause=cause.__name__):
+                hec = HecForwarder(host="localhost", port=8088, token="", use_ssl=False, batch_size=2, max_retries=0)
+                route = respx.post("http://localhost:8088/services/collector/event")
+                route.side_effect = [httpx.Response(200, json={"text": "Success", "code": 0}), failure]
+
+                with self.assertRaises(HecPartialDeliveryError) as raised:
+                    hec.forward_events([{"message": str(index)} for index in range(4)])
+
+                self.assertEqual(raised.exception.accepted_count, 2)
+                self.assertEqual(raised.exception.total_count, 4)
+                self.assertIsInstance(raised.exception.__cause__, cause)
+                hec.close()
+
     @respx.mock
     def test_forward_event_waits_for_indexer_acknowledgment(self):
         hec = HecForwarder(
@@ -351,6 +464,22 @@ class TestHecForwarder(unittest.TestCase):
         with self.assertRaises(RuntimeError):
             hec.forward_event({"message": "test"})
 
+    @respx.mock
+    def test_batch_forwarder_is_closed_at_exit(self):
+        from splunk_logging.forwarders import BatchHecForwarder, _close_batch_forwarders, _open_batch_forwarders
+
+        route = respx.post("http://localhost:8088/services/collector/event")
+        route.return_value = httpx.Response(200, json={"text": "Success", "code": 0})
+        hec = BatchHecForwarder(host="localhost", port=8088, token="", use_ssl=False, flush_interval=60)
+        hec.forward_event({"message": "queued"})
+
+        _close_batch_forwarders()
+
+        self.assertEqual(json.loads(route.calls.last.request.content)["event"], {"message": "queued"})
+        self.assertNotIn(hec, _open_batch_forwarders)
+        with self.assertRaises(RuntimeError):
+            hec.forward_event({"message": "test"})
+
     def test_batch_forwarder_rejects_invalid_limits(self):
         from splunk_logging.forwarders import BatchHecForwarder
 
@@ -794,6 +923,24 @@ class TestHecForwarder(unittest.TestCase):
         self.assertEqual(sleep.call_count, 3)
         return
 
+    @respx.mock
+    @patch("splunk_logging.forwarders.time.sleep")
+    def test_retry_uses_configured_attempts_and_backoff(self, sleep):
+        hec = HecForwarder(host="localhost", port=8088, token="", use_ssl=False, max_retries=1, backoff_factor=0.5)
+        route = respx.post("http://localhost:8088/services/collector/event")
+        route.return_value = httpx.Response(httpx.codes.REQUEST_TIMEOUT)
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            hec.forward_event({"message": "test"})
+
+        self.assertEqual(route.call_count, 2)
+        sleep.assert_called_once_with(0.5)
+
+    def test_retry_rejects_negative_options(self):
+        for options in ({"max_retries": -1}, {"backoff_factor": -1}):
+            with self.subTest(options=options), self.assertRaises(ValueError):
+                HecForwarder(host="localhost", token="", use_ssl=False, **options)
+
     @respx.mock
     @patch("splunk_logging.forwarders.time.sleep")
     def test_retry_returns_successful_response(self, _sleep):
@@ -924,9 +1071,142 @@ class TestHecForwarder(unittest.TestCase):
 
         self.assertEqual(hec._parse_timestamp(dt), ts)
         self.assertEqual(hec._parse_timestamp(ts), ts)
+        self.assertEqual(hec._parse_timestamp(int(ts)), float(int(ts)))
+        self.assertEqual(hec._parse_timestamp(type("Float", (float,), {})(ts)), ts)
         self.assertEqual(hec._parse_timestamp(dt.isoformat()), ts)
         self.assertEqual(hec._parse_timestamp(dt.isoformat(), timefmt="%Y-%m-%dT%H:%M:%S"), ts)
+        self.assertEqual(hec._parse_timestamp("2026-01-01T12:00:00Z"), 1767268800.0)
+        self.assertEqual(hec._parse_timestamp("2026-01-01T24:00:00"), datetime(2026, 1, 2).timestamp())
+
+        for invalid in ("invalid timestamp", float("nan"), float("inf"), True, None):
+            with self.subTest(timeinfo=invalid), self.assertRaises(ValueError):
+                hec._parse_timestamp(invalid)
+        return
+
+    def test_parse_timestamp_caches_strings(self):
+        hec = self.create_forwarder()
+        _parse_timestamp_str.cache_clear()
+
+        for _ in range(3):
+            self.assertEqual(hec._parse_timestamp("2026-01-01T12:00:00Z"), 1767268800.0)
+
+        self.assertEqual(_parse_timestamp_str.cache_info().hits, 2)
+
+    def test_encode_hec_event_matches_serialized_envelope(self):
+        forwarders = (
+            self.create_forwarder(),
+            HecForwarder(
+                host="localhost", port=8088, token="", use_ssl=False, default_host="web-1", default_index="main"
+            ),
+        )
+        event = {"message": "tést", "level": 1}
+
+        for hec in forwarders:
+            for kwargs in ({}, {"host": "web-2", "sourcetype": "_json"}):
+                with self.subTest(defaults=hec._default_fields_json, kwargs=kwargs):
+                    expected = hec._serialize_hec_event(hec._build_hec_event(event, eventtime=1767268800, **kwargs))
+                    self.assertEqual(hec._encode_hec_event(event, eventtime=1767268800, **kwargs), expected)
+        return
+
+    def test_encode_hec_event_escapes_lone_surrogates(self):
+        hec = self.create_forwarder()
+        event = {"path": "/tmp/\udcff", "user": "\u00e9"}
 
-        with self.assertRaises(ValueError):
-            hec._parse_timestamp("invalid timestamp")
+        for kwargs in ({}, {"host": "web-2"}):
+            with self.subTest(kwargs=kwargs):
+                self.assertEqual(json.loads(hec._encode_hec_event(event, **kwargs))["event"], event)
         return
+
+
+class TestAsyncHecForwarder(unittest.IsolatedAsyncioTestCase):
+    def create_forwarder(self, **kwargs) -> AsyncHecForwarder:
+        return AsyncHecForwarder(host="localhost", port=8088, token="", use_ssl=False, **kwargs)
+
+    @respx.mock
+    async def test_forward_event(self):
+        route = respx.post("http://localhost:8088/services/collector/event")
+        route.return_value = httpx.Response(200, json={"text": "Success", "code": 0})
+
+        async with self.create_forwarder(channel_id=TEST_CHANNEL_ID) as hec:
+            await hec.forward_event({"message": "test"})
+
+            route.return_value = httpx.Response(400, json={"text": "Incorrect data format", "code": 5})
+            with self.assertRaises(httpx.HTTPStatusError):
+                await hec.forward_event({"message": "test"})
+
+        self.assertEqual(json.loads(route.calls[0].request.content)["event"], {"message": "test"})
+        self.assertEqual(route.calls[0].request.headers["X-Splunk-Request-Channel"], TEST_CHANNEL_ID)
+
+    @respx.mock
+    async def test_forward_event_calls_run_concurrently(self):
+        route = respx.post("http://localhost:8088/services/collector/event")
+        route.return_value = httpx.Response(200, json={"text": "Success", "code": 0})
+
+        async with self.create_forwarder() as hec:
+            await asyncio.gather(*(hec.forward_event({"message": str(index)}, index=str(index)) for index in range(3)))
+
+        self.assertEqual(route.call_count, 3)
+
+    @respx.mock
+    async def test_forward_events_reports_acceptance_across_requests(self):
+        from splunk_logging.exceptions import HecBatchError
+
+        route = respx.post("http://localhost:8088/services/collector/event")
+        route.side_effect = [
+            httpx.Response(200, json={"text": "Success", "code": 0}),
+            httpx.Response(400, json={"text": "Incorrect data format", "code": 5, "invalid-event-number": 1}),
+        ]
+
+        async with self.create_forwarder(batch_size=2) as hec:
+            with self.assertRaises(HecBatchError) as raised:
+                await hec.forward_events([{"message": str(index)} for index in range(4)])
+
+        self.assertEqual(route.call_count, 2)
+        self.assertEqual(raised.exception.accepted_count, 3)
+        self.assertEqual(raised.exception.total_count, 4)
+
+    @respx.mock
+    async def test_forward_events_reports_acceptance_before_later_request_failures(self):
+        from splunk_logging.exceptions import HecPartialDeliveryError
+
+        route = respx.post("http://localhost:8088/services/collector/event")
+        route.side_effect = [httpx.Response(200, json={"text": "Success", "code": 0}), httpx.ConnectError("refused")]
+
+        async with self.create_forwarder(batch_size=2, max_retries=0) as hec:
+            with self.assertRaises(HecPartialDeliveryError) as raised:
+                await hec.forward_events([{"message": str(index)} for index in range(4)])
+
+        self.assertEqual(raised.exception.accepted_count, 2)
+        self.assertIsInstance(raised.exception.__cause__, httpx.ConnectError)
+
+    @respx.mock
+    async def test_forward_event_waits_for_indexer_acknowledgment(self):
+        event_route = respx.post("http://localhost:8088/services/collector/event")
+        event_route.return_value = httpx.Response(200, json={"text": "Success", "code": 0, "ackId": 7})
+        ack_route = respx.post("http://localhost:8088/services/collector/ack")
+        ack_route.side_effect = [
+            httpx.Response(200, json={"acks": {"7": False}}),
+            httpx.Response(200, json={"acks": {"7": True}}),
+        ]
+
+        async with self.create_forwarder(indexer_ack=True, ack_poll_interval=0) as hec:
+            await hec.forward_event({"message": "test"})
+
+        self.assertEqual(ack_route.call_count, 2)
+        self.assertEqual(json.loads(ack_route.calls.last.request.content), {"acks": [7]})
+
+    @respx.mock
+    @patch("splunk_logging.forwarders.asyncio.sleep")
+    async def test_retry(self, sleep):
+        route = respx.post("http://localhost:8088/services/collector/event")
+        route.return_value = httpx.Response(
+            httpx.codes.SERVICE_UNAVAILABLE,
+            json={"text": "Server is busy", "code": 9},
+        )
+
+        async with self.create_forwarder() as hec:
+            with self.assertRaises(httpx.HTTPStatusError):
+                await hec.forward_event({"message": "test"})
+
+        self.assertEqual(route.call_count, 4)
+        self.assertEqual(sleep.await_count, 3)
@@ -12,15 +12,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
+import io
 import json
 import logging
+import threading
+import time
 import unittest
+import weakref
+from decimal import Decimal
 
 import httpx
 import respx
 
 from splunk_logging.formatters import JsonFormatter
-from splunk_logging.handlers import HecHandler
+from splunk_logging.handlers import BufferedJsonHandler, BytesStreamHandler, HecHandler, ThreadedJsonHandler
 
 TEST_CHANNEL_ID = "00000000-0000-4000-8000-000000000001"
 
@@ -51,6 +57,55 @@ class TestHecHandler(unittest.TestCase):
         self.assertEqual(json.dumps(sent_event["event"]), json.dumps(event))
         return
 
+    @respx.mock
+    def test_hec_logger_uses_record_overrides(self):
+        self.create_logger()
+        route = respx.post("http://localhost:8088/services/collector/event")
+        route.return_value = httpx.Response(200, json={"text": "Success", "code": 0})
+
+        self.log.info({"message": "test"}, extra={"host": "web-1", "source": "app", "index": "main"})
+
+        sent_event = json.loads(route.calls.last.request.content)
+        self.assertEqual(sent_event["host"], "web-1")
+        self.assertEqual(sent_event["source"], "app")
+        self.assertEqual(sent_event["index"], "main")
+        return
+
+    @respx.mock
+    def test_hec_logger_parses_json_from_other_formatters(self):
+        log = logging.Logger("formatter")
+        handler = HecHandler(host="localhost", port=8088, token="", use_ssl=False, ignore_exceptions=False)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log.addHandler(handler)
+        route = respx.post("http://localhost:8088/services/collector/event")
+        route.return_value = httpx.Response(200, json={"text": "Success", "code": 0})
+
+        log.info(json.dumps({"message": "test"}))
+
+        self.assertEqual(json.loads(route.calls.last.request.content)["event"], {"message": "test"})
+
+    @respx.mock
+    def test_hec_logger_uses_json_formatter_serialization(self):
+        class UpperFormatter(JsonFormatter):
+            def format(self, record):
+                return super().format(record).upper()
+
+        route = respx.post("http://localhost:8088/services/collector/event")
+        route.return_value = httpx.Response(200, json={"text": "Success", "code": 0})
+        for formatter, msg, expected in (
+            (JsonFormatter(serializer_args={"default": str}), {"d": Decimal("1.5")}, {"d": "1.5"}),
+            (UpperFormatter(), {"message": "test"}, {"MESSAGE": "TEST"}),
+        ):
+            with self.subTest(formatter=type(formatter).__name__):
+                log = logging.Logger("formatter")
+                handler = HecHandler(host="localhost", port=8088, token="", use_ssl=False, ignore_exceptions=False)
+                handler.setFormatter(formatter)
+                log.addHandler(handler)
+
+                log.info(msg)
+
+                self.assertEqual(json.loads(route.calls.last.request.content)["event"], expected)
+
     @respx.mock
     def test_hec_logger_supports_indexer_acknowledgment(self):
         log = logging.Logger("ack")
@@ -106,3 +161,255 @@ class TestHecHandler(unittest.TestCase):
         self.assertEqual(offset, len(payload))
         self.assertEqual(first["event"]["message"], "first")
         self.assertEqual(second["event"]["message"], "second")
+
+    @respx.mock
+    def test_hec_logger_counts_records_dropped_from_full_queue(self):
+        log = logging.Logger("drop")
+        handler = HecHandler(
+            host="localhost",
+            port=8088,
+            token="",
+            use_ssl=False,
+            batch_enabled=True,
+            batch_size=1,
+            max_queue_size=1,
+            enqueue_timeout=0,
+        )
+        log.addHandler(handler)
+        release_request = threading.Event()
+        route = respx.post("http://localhost:8088/services/collector/event")
+
+        def block_request(_request):
+            release_request.wait(1)
+            return httpx.Response(200, json={"text": "Success", "code": 0})
+
+        route.side_effect = block_request
+
+        try:
+            for index in range(3):
+                log.info({"message": index})
+        finally:
+            release_request.set()
+            handler.close()
+
+        self.assertEqual(handler.dropped_records, 2)
+        self.assertEqual(route.call_count, 1)
+
+    @respx.mock
+    def test_hec_logger_reports_background_delivery_failure_once(self):
+        from splunk_logging.forwarders import _close_batch_forwarders
+
+        log = logging.Logger("failure")
+        handler = HecHandler(host="localhost", port=8088, token="", use_ssl=False, batch_enabled=True, batch_size=1)
+        log.addHandler(handler)
+        request_finished = threading.Event()
+        route = respx.post("http://localhost:8088/services/collector/event")
+
+        def reject_request(_request):
+            request_finished.set()
+            return httpx.Response(400, json={"text": "Incorrect data format", "code": 5})
+
+        route.side_effect = reject_request
+        log.info({"message": "test"})
+        self.assertTrue(request_finished.wait(1))
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            # The same order as at exit: the atexit hook, then logging.shutdown flushing and closing the handler.
+            _close_batch_forwarders()
+            handler.flush()
+            handler.close()
+
+        self.assertEqual(len(output.getvalue().splitlines()), 1)
+        self.assertIn("Exception when flushing logs to Splunk", output.getvalue())
+
+
+class TestBytesStreamHandler(unittest.TestCase):
+    def test_writes_one_line_per_record(self):
+        stream = io.BytesIO()
+        log = logging.Logger("bytes")
+        log.addHandler(BytesStreamHandler(stream))
+
+        log.info({"a": 1})
+        log.info({"b": "\u00e9"})
+
+        self.assertEqual(stream.getvalue(), b'{"a": 1}\n{"b": "\\u00e9"}\n')
+
+    def test_encodes_other_formatters(self):
+        stream = io.BytesIO()
+        log = logging.Logger("bytes")
+        handler = BytesStreamHandler(stream)
+        handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        log.addHandler(handler)
+
+        log.info("hello world")
+
+        self.assertEqual(stream.getvalue(), b"INFO hello world\n")
+
+    def test_uses_json_formatter_format_overrides(self):
+        class UpperFormatter(JsonFormatter):
+            def format(self, record):
+                return super().format(record).upper()
+
+        stream = io.BytesIO()
+        log = logging.Logger("bytes")
+        handler = BytesStreamHandler(stream)
+        handler.setFormatter(UpperFormatter())
+        log.addHandler(handler)
+
+        log.info({"a": "b"})
+
+        self.assertEqual(stream.getvalue(), b'{"A": "B"}\n')
+
+
+class RecordingStream(io.BytesIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append(bytes(data))
+        return super().write(data)
+
+
+class TestBufferedJsonHandler(unittest.TestCase):
+    def create_logger(self, **kwargs):
+        self.stream = RecordingStream()
+        self.handler = BufferedJsonHandler(self.stream, **kwargs)
+        self.addCleanup(self.handler.close)
+        self.log = logging.Logger("buffered")
+        self.log.addHandler(self.handler)
+
+    def test_coalesces_records_until_flush(self):
+        self.create_logger(flush_interval=60)
+
+        for index in range(1, 4):
+            self.log.info({"index": index})
+        self.assertEqual(self.stream.writes, [])
+
+        self.handler.flush()
+        self.assertEqual(self.stream.writes, [b'{"index": 1}\n{"index": 2}\n{"index": 3}\n'])
+
+    def test_writes_when_capacity_is_reached(self):
+        self.create_logger(capacity=30, flush_interval=60)
+
+        for index in range(1, 6):
+            self.log.info({"index": index})
+
+        self.assertEqual(self.stream.writes, [b'{"index": 1}\n{"index": 2}\n{"index": 3}\n'])
+
+    def test_writes_after_flush_interval(self):
+        self.create_logger(flush_interval=0.01)
+        written = threading.Event()
+        write = self.stream.write
+
+        def record_write(data):
+            write(data)
+            written.set()
+
+        self.stream.write = record_write
+        self.log.info({"message": "test"})
+
+        self.assertTrue(written.wait(5))
+        self.assertEqual(self.stream.writes, [b'{"message": "test"}\n'])
+
+    def test_close_writes_buffered_records(self):
+        self.create_logger(flush_interval=60)
+        self.log.info({"message": "test"})
+
+        self.handler.close()
+
+        self.assertEqual(self.stream.getvalue(), b'{"message": "test"}\n')
+
+    def test_shutdown_writes_buffered_records(self):
+        self.create_logger(flush_interval=0.05)
+        self.log.info({"message": "test"})
+
+        def shutdown():
+            # logging.shutdown holds the handler lock while it flushes and closes the handler, so the flusher waking
+            # up in the meantime waits for it.
+            with self.handler.lock:
+                time.sleep(0.2)
+                logging.shutdown([weakref.ref(self.handler)])
+
+        thread = threading.Thread(target=shutdown, daemon=True)
+        thread.start()
+        thread.join(10)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(self.stream.getvalue(), b'{"message": "test"}\n')
+        self.handler._flusher.join(5)
+        self.assertFalse(self.handler._flusher.is_alive())
+
+    def test_rejects_invalid_options(self):
+        for options in ({"capacity": 0}, {"flush_interval": 0}):
+            with self.subTest(options=options), self.assertRaises(ValueError):
+                BufferedJsonHandler(io.BytesIO(), **options)
+
+
+class TestThreadedJsonHandler(unittest.TestCase):
+    def create_logger(self):
+        self.stream = RecordingStream()
+        self.handler = ThreadedJsonHandler(self.stream)
+        self.addCleanup(self.handler.close)
+        self.log = logging.Logger("threaded")
+        self.log.addHandler(self.handler)
+
+    def test_writes_records_from_all_threads(self):
+        self.create_logger()
+
+        def log_records(thread):
+            for index in range(1, 101):
+                self.log.info({"thread": thread, "index": index})
+
+        threads = [threading.Thread(target=log_records, args=(thread,)) for thread in range(1, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.handler.flush()
+
+        records = [json.loads(line) for line in self.stream.getvalue().splitlines()]
+        self.assertEqual(len(records), 400)
+        for thread in range(1, 5):
+            indexes = [record["index"] for record in records if record["thread"] == thread]
+            self.assertEqual(indexes, list(range(1, 101)))
+
+    def test_records_are_formatted_without_the_handler_lock(self):
+        self.create_logger()
+        producer = threading.Thread(target=self.log.info, args=({"message": "test"},))
+
+        with self.handler.lock:
+            producer.start()
+            producer.join(5)
+            self.assertFalse(producer.is_alive())
+
+        self.handler.flush()
+        self.assertEqual(self.stream.getvalue(), b'{"message": "test"}\n')
+
+    def test_close_writes_queued_records(self):
+        self.create_logger()
+        self.log.info({"message": "test"})
+
+        self.handler.close()
+
+        self.assertEqual(self.stream.getvalue(), b'{"message": "test"}\n')
+
+    def test_shutdown_writes_queued_records(self):
+        self.create_logger()
+        write = self.stream.write
+
+        def slow_write(data):
+            time.sleep(0.01)
+            return write(data)
+
+        self.stream.write = slow_write
+        for index in range(1, 2001):
+            self.log.info({"index": index})
+        # logging.shutdown holds the handler lock while it flushes and closes the handler.
+        shutdown = threading.Thread(target=logging.shutdown, args=([weakref.ref(self.handler)],), daemon=True)
+        shutdown.start()
+        shutdown.join(10)
+
+        self.assertFalse(shutdown.is_alive())
+        self.assertEqual(len(self.stream.getvalue().splitlines()), 2000)
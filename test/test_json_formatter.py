@@ -17,15 +17,22 @@ import json
 import logging
 import traceback
 import unittest
+from unittest.mock import patch
 
 from splunk_logging.formatters import JsonFormatter
+from splunk_logging.handlers import BytesStreamHandler
 
 
 class TestJsonFormatter(unittest.TestCase):
-    def create_logger(self, formatter):
+    def create_logger(self, formatter, binary=False):
         self.log = logging.Logger("root")
-        self.stream = io.StringIO()
-        self.handler = logging.StreamHandler(self.stream)
+        if binary:
+            # Records are written with JsonFormatter.format_bytes.
+            self.stream = io.BytesIO()
+            self.handler = BytesStreamHandler(self.stream)
+        else:
+            self.stream = io.StringIO()
+            self.handler = logging.StreamHandler(self.stream)
         self.log.addHandler(self.handler)
         self.log.setLevel(logging.DEBUG)
         self.handler.setFormatter(formatter)
@@ -35,6 +42,11 @@ class TestJsonFormatter(unittest.TestCase):
         self.log.info({"a": 1, "b": 2})
         self.assertEqual(self.stream.getvalue(), '{"a": 1, "b": 2}\n')
 
+    def test_readme_empty_bytes(self):
+        self.create_logger(JsonFormatter(), binary=True)
+        self.log.info({"a": 1, "b": 2})
+        self.assertEqual(self.stream.getvalue(), b'{"a": 1, "b": 2}\n')
+
     def test_readme_format(self):
         self.create_logger(
             JsonFormatter(
@@ -51,11 +63,56 @@ class TestJsonFormatter(unittest.TestCase):
             '{"a": 1, "b": 2, "level": "INFO", "name": "root"}\n',
         )
 
+    def test_readme_format_bytes(self):
+        self.create_logger(
+            JsonFormatter(
+                level="%(levelname)s",
+                name="%(name)s",
+                message="%(message)s",
+            ),
+            binary=True,
+        )
+        self.log.info("hello world")
+        self.log.info({"a": 1, "b": 2})
+        self.assertEqual(
+            self.stream.getvalue(),
+            b'{"level": "INFO", "name": "root", "message": "hello world"}\n'
+            b'{"a": 1, "b": 2, "level": "INFO", "name": "root"}\n',
+        )
+
+    def test_message_args(self):
+        """
+        Make sure messages are formatted with their args, and non-string messages are converted to strings.
+        """
+        self.create_logger(JsonFormatter(message="%(message)s"))
+        self.log.info("hello %s", "world")
+        self.log.info(["hello", 1])
+        self.log.info("100%")
+        self.assertEqual(
+            self.stream.getvalue(),
+            '{"message": "hello world"}\n{"message": "[\'hello\', 1]"}\n{"message": "100%"}\n',
+        )
+
     def test_readme_prune(self):
         self.create_logger(JsonFormatter(prune_keys=False))
         self.log.info({"a": 1, "b": 2, "c": ""})
         self.assertEqual(self.stream.getvalue(), '{"a": 1, "b": 2, "c": ""}\n')
 
+    def test_readme_prune_bytes(self):
+        self.create_logger(JsonFormatter(prune_keys=False), binary=True)
+        self.log.info({"a": 1, "b": 2, "c": ""})
+        self.assertEqual(self.stream.getvalue(), b'{"a": 1, "b": 2, "c": ""}\n')
+
+    def test_prune_keeps_message(self):
+        """
+        Make sure pruning a message without default keys doesn't modify the logged dict.
+        """
+        self.create_logger(JsonFormatter())
+        msg = {"a": 1, "b": ""}
+        self.log.info(msg)
+        self.assertEqual(self.stream.getvalue(), '{"a": 1}\n')
+        self.assertEqual(msg, {"a": 1, "b": ""})
+
     def test_readme_format_prune(self):
         self.create_logger(
             JsonFormatter(
@@ -69,6 +126,20 @@ class TestJsonFormatter(unittest.TestCase):
         expected = '{"a": 1, "b": 2, "level": "INFO", "name": "root", "message": ""}\n'
         self.assertEqual(self.stream.getvalue(), expected)
 
+    def test_readme_format_prune_bytes(self):
+        self.create_logger(
+            JsonFormatter(
+                level="%(levelname)s",
+                name="%(name)s",
+                message="%(message)s",
+                prune_keys=False,
+            ),
+            binary=True,
+        )
+        self.log.info({"a": 1, "b": 2})
+        expected = b'{"a": 1, "b": 2, "level": "INFO", "name": "root", "message": ""}\n'
+        self.assertEqual(self.stream.getvalue(), expected)
+
     def test_log_exception(self):
         """
         Make sure log.exception() logs the traceback.
@@ -83,6 +154,25 @@ class TestJsonFormatter(unittest.TestCase):
         self.assertIn("exception", obj)
         self.assertEqual(obj["exception"], exc.rstrip("\n"))
 
+    def test_log_exception_is_formatted_once(self):
+        """
+        Make sure the traceback is cached on the record and shared with other handlers.
+        """
+        formatter = JsonFormatter()
+        self.create_logger(formatter)
+        stream = io.StringIO()
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self.log.addHandler(handler)
+        try:
+            ()()
+        except TypeError:
+            with patch.object(formatter, "formatException", wraps=formatter.formatException) as format_exception:
+                self.log.exception({"a": 1})
+        format_exception.assert_called_once()
+        exception = json.loads(self.stream.getvalue())["exception"]
+        self.assertEqual(stream.getvalue(), "{'a': 1}\n" + exception + "\n")
+
     def test_log_stack(self):
         """
         Make sure log.info(..., stack_info=True) logs the stack.
@@ -128,6 +218,149 @@ class TestJsonFormatter(unittest.TestCase):
         )
         self.assertEqual(self.stream.getvalue(), expected)
 
+    def test_prune_overridden_default(self):
+        """
+        Make sure an empty value still overrides a default key before it is pruned.
+        """
+        self.create_logger(JsonFormatter(level="%(levelname)s", name="%(name)s"))
+        self.log.info({"a": 0, "b": 2, "level": ""})
+        self.assertEqual(self.stream.getvalue(), '{"b": 2, "name": "root"}\n')
+
+    def test_static_default_keys(self):
+        """
+        Make sure default keys without format specifiers keep their position among formatted keys.
+        """
+        self.create_logger(JsonFormatter(app="api", level="%(levelname)s", usage="100%%", logger="%(name)s"))
+        self.log.info({"a": 1})
+        self.assertEqual(
+            self.stream.getvalue(),
+            '{"a": 1, "app": "api", "level": "INFO", "usage": "100%", "logger": "root"}\n',
+        )
+
+    def test_missing_default_key_attributes(self):
+        """
+        Make sure default keys formatted with attributes missing from the log record use empty strings.
+        """
+        self.create_logger(JsonFormatter(prune_keys=False, request="%(request_id)s", user="user=%(user)s"))
+        self.log.info({"a": 1})
+        self.log.info({"a": 1}, extra={"request_id": 7, "user": "admin"})
+        self.assertEqual(
+            self.stream.getvalue(),
+            '{"a": 1, "request": "", "user": "user="}\n{"a": 1, "request": "7", "user": "user=admin"}\n',
+        )
+
+    def test_record_attribute_default_keys(self):
+        """
+        Make sure default keys formatted with a single log record attribute are converted to strings like "%s".
+        """
+        record = logging.LogRecord("root", logging.INFO, __file__, 12, {"a": 1}, None, None)
+        formatter = JsonFormatter(level="%(levelname)s", line="%(lineno)s", func="%(funcName)s")
+        self.assertEqual(formatter.format_dict(record), {"a": 1, "level": "INFO", "line": "12", "func": "None"})
+
+    def test_asctime(self):
+        """
+        Make sure the record time is only formatted when a default key uses it.
+        """
+        record = logging.LogRecord("root", logging.INFO, __file__, 1, {"a": 1}, None, None)
+        formatter = JsonFormatter(time="%(asctime)s", datefmt="%Y")
+        self.assertEqual(formatter.format_dict(record), {"a": 1, "time": formatter.formatTime(record, "%Y")})
+
+        formatter = JsonFormatter(level="%(levelname)s")
+        with patch.object(formatter, "formatTime") as format_time:
+            self.assertEqual(formatter.format_dict(record), {"a": 1, "level": "INFO"})
+        format_time.assert_not_called()
+
+    def test_compact(self):
+        """
+        Make sure compact output of plain values is the same with and without orjson installed.
+        """
+        expected = '{"a":1,"b":"\u00e9","level":"INFO"}\n'
+        self.create_logger(JsonFormatter(compact=True, level="%(levelname)s"))
+        self.log.info({"a": 1, "b": "\u00e9"})
+        self.assertEqual(self.stream.getvalue(), expected)
+
+        with patch("splunk_logging._json.orjson", None):
+            self.create_logger(JsonFormatter(compact=True, level="%(levelname)s"))
+            self.log.info({"a": 1, "b": "\u00e9"})
+        self.assertEqual(self.stream.getvalue(), expected)
+
+    def test_lean(self):
+        """
+        Make sure lean mode merges dict messages with static default keys without pruning them.
+        """
+        self.create_logger(JsonFormatter(lean=True, app="api"))
+        self.log.info({"a": 1, "b": ""})
+        self.log.info({"app": "worker"})
+        self.log.info("hello world")
+        self.assertEqual(
+            self.stream.getvalue(),
+            '{"a": 1, "b": "", "app": "api"}\n{"app": "worker"}\n{"app": "api"}\n',
+        )
+
+        record = logging.LogRecord("root", logging.INFO, __file__, 1, {"a": 1, "b": ""}, None, None)
+        formatter = JsonFormatter(lean=True)
+        self.assertEqual(formatter.format(record), '{"a": 1, "b": ""}')
+        self.assertEqual(formatter.format_bytes(record), b'{"a": 1, "b": ""}\n')
+        self.assertEqual(formatter.format_dict(record), {"a": 1, "b": ""})
+        self.assertEqual(formatter.format_fields({"a": 1, "b": ""}), b'{"a": 1, "b": ""}\n')
+
+    def test_lean_with_formatted_default_keys(self):
+        """
+        Make sure lean mode is not used when a default key is formatted with log record attributes.
+        """
+        self.create_logger(JsonFormatter(lean=True, level="%(levelname)s"))
+        self.log.info({"a": 1, "b": ""})
+        self.assertEqual(self.stream.getvalue(), '{"a": 1, "level": "INFO"}\n')
+
+    def test_compact_falls_back_for_unsupported_values(self):
+        """
+        Make sure compact output falls back to the json module for values orjson can't serialize.
+        """
+        self.create_logger(JsonFormatter(compact=True))
+        self.log.info({"a": 2**70})
+        self.assertEqual(self.stream.getvalue(), '{"a":1180591620717411303424}\n')
+
+    def test_compact_escapes_lone_surrogates(self):
+        """
+        Make sure compact output escapes strings that can't be encoded as UTF-8.
+        """
+        record = logging.LogRecord("root", logging.INFO, __file__, 1, {"path": "/tmp/\udcff"}, None, None)
+        formatter = JsonFormatter(compact=True)
+        self.assertEqual(formatter.format(record), '{"path":"/tmp/\\udcff"}')
+        self.assertEqual(formatter.format_bytes(record), b'{"path":"/tmp/\\udcff"}\n')
+
+    def test_format_dict_overrides(self):
+        """
+        Make sure format and format_bytes use an overridden format_dict, with and without default keys.
+        """
+
+        class TaggedFormatter(JsonFormatter):
+            def format_dict(self, record):
+                return {**super().format_dict(record), "tag": "x"}
+
+        record = logging.LogRecord("root", logging.INFO, __file__, 1, {"a": 1}, None, None)
+        for default_keys, expected in (({}, {"a": 1, "tag": "x"}), ({"app": "y"}, {"a": 1, "app": "y", "tag": "x"})):
+            with self.subTest(default_keys=default_keys):
+                formatter = TaggedFormatter(**default_keys)
+                self.assertEqual(json.loads(formatter.format(record)), expected)
+                self.assertEqual(json.loads(formatter.format_bytes(record)), expected)
+
+    def test_format_bytes(self):
+        """
+        Make sure bytes output matches format with a trailing newline.
+        """
+        record = logging.LogRecord("root", logging.INFO, __file__, 1, {"a": 1, "b": "\u00e9"}, None, None)
+        for compact in (False, True):
+            with self.subTest(compact=compact):
+                formatter = JsonFormatter(compact=compact, level="%(levelname)s")
+                self.assertEqual(formatter.format_bytes(record), (formatter.format(record) + "\n").encode("utf-8"))
+
+        record.msg = {"a": 2**70}
+        formatter = JsonFormatter(compact=True)
+        self.assertEqual(formatter.format_bytes(record), b'{"a":1180591620717411303424}\n')
+        with patch("splunk_logging._json.orjson", None):
+            self.assertEqual(formatter.format_bytes(record), b'{"a":1180591620717411303424}\n')
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,75 @@
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import io
+import logging
+import unittest
+from unittest.mock import patch
+
+from splunk_logging.formatters import JsonFormatter
+from splunk_logging.handlers import BufferedJsonHandler, BytesStreamHandler
+from splunk_logging.loggers import StructuredLogger
+
+
+class TestStructuredLogger(unittest.TestCase):
+    def create_logger(self, formatter: JsonFormatter | None = None) -> StructuredLogger:
+        self.stream = io.BytesIO()
+        self.handler = BytesStreamHandler(self.stream)
+        if formatter is not None:
+            self.handler.setFormatter(formatter)
+        self.log = logging.Logger("structured")
+        self.log.addHandler(self.handler)
+        return StructuredLogger(self.log)
+
+    def test_writes_fields_without_log_record(self):
+        formatter = JsonFormatter(compact=True, app="web", empty="")
+        structured = self.create_logger(formatter)
+
+        with patch.object(self.log, "makeRecord") as make_record:
+            structured.info(message="test", count=1, missing=None)
+        make_record.assert_not_called()
+
+        record = logging.LogRecord("structured", logging.INFO, "", 0, {"message": "test", "count": 1}, None, None)
+        self.assertEqual(self.stream.getvalue(), formatter.format_bytes(record))
+        self.assertEqual(self.stream.getvalue(), b'{"message":"test","count":1,"app":"web"}\n')
+
+    def test_checks_logger_and_handler_levels(self):
+        structured = self.create_logger()
+        self.log.setLevel(logging.INFO)
+        structured.debug(message="debug")
+        self.handler.setLevel(logging.ERROR)
+        structured.warning(message="warning")
+        structured.error(message="error")
+
+        self.assertEqual(self.stream.getvalue(), b'{"message": "error"}\n')
+
+    def test_falls_back_to_log_records(self):
+        structured = self.create_logger(JsonFormatter(level="%(levelname)s"))
+        structured.warning(message="test")
+
+        self.assertEqual(self.stream.getvalue(), b'{"message": "test", "level": "WARNING"}\n')
+
+    def test_writes_through_handler_buffers(self):
+        structured = self.create_logger()
+        buffered = BufferedJsonHandler(self.stream, flush_interval=60)
+        self.addCleanup(buffered.close)
+        self.log.removeHandler(self.handler)
+        self.log.addHandler(buffered)
+
+        structured.info(message="test")
+        self.assertEqual(self.stream.getvalue(), b"")
+
+        buffered.flush()
+        self.assertEqual(self.stream.getvalue(), b'{"message": "test"}\n')